@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Icon drawing for FreePBX Popup Client - Resource creation module for source launches.
+Renders the application and menu bar icons; only imported when an icon has to be drawn.
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import importlib
+import subprocess
+
+# Icons rendered from SVG, keyed by the SVG source and output size
+SVG_CACHE_DIR = os.path.join('resources', '.cache')
+
+# Packages pip has already been asked to install in this process
+_INSTALL_ATTEMPTED = set()
+
+def import_or_install(module_name, package):
+    """Import a module, installing its package with pip the first time it is missing"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        if package in _INSTALL_ATTEMPTED:
+            raise
+        _INSTALL_ATTEMPTED.add(package)
+        subprocess.run([sys.executable, '-m', 'pip', 'install', package])
+        importlib.invalidate_caches()
+        return importlib.import_module(module_name)
+
+def create_icon():
+    """Create icon for the application"""
+    try:
+        if not os.path.exists('resources'):
+            os.makedirs('resources')
+
+        try:
+            create_fa_icon()
+        except Exception as e:
+            print(f"Failed to create Font Awesome icon: {e}")
+            create_simple_icon()
+    except Exception as e:
+        print(f"Error creating icon: {e}")
+
+def svg_cache_path(svg, width, height):
+    """Get the cache path for an SVG rendered at the given size"""
+    key = hashlib.sha1(svg.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(SVG_CACHE_DIR, f'{key}_{width}x{height}.png')
+
+def store_in_svg_cache(png_path, cache_path):
+    """Keep a copy of a rendered icon for later launches"""
+    try:
+        os.makedirs(SVG_CACHE_DIR, exist_ok=True)
+        shutil.copyfile(png_path, cache_path)
+    except OSError as e:
+        print(f"Failed to cache rendered icon: {e}")
+
+def create_fa_icon():
+    """Create a Font Awesome icon"""
+    try:
+        phone_icon_svg = """
+        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512">
+        <path fill="#3498db" d="M164.9 24.6c-7.7-18.6-28-28.5-47.4-23.2l-88 24C12.1 30.2 0 46 0 64C0 311.4 200.6 512 448 512c18 0 33.8-12.1 38.6-29.5l24-88c5.3-19.4-4.6-39.7-23.2-47.4l-96-40c-16.3-6.8-35.2-2.1-46.3 11.6L304.7 368C234.3 334.7 177.3 277.7 144 207.3L193.3 167c13.7-11.2 18.4-30 11.6-46.3l-40-96z"/>
+        </svg>
+        """
+
+        # Reuse an earlier rendering of the same SVG
+        cache_path = svg_cache_path(phone_icon_svg, 128, 128)
+        if os.path.exists(cache_path):
+            shutil.copyfile(cache_path, 'resources/icon.png')
+            create_white_menu_bar_icon()
+            print("Font Awesome icon restored from cache at resources/icon.png")
+            return
+
+        cairosvg = import_or_install('cairosvg', 'cairosvg')
+
+        # cairosvg writes the PNG itself; there is nothing to re-encode
+        cairosvg.svg2png(bytestring=phone_icon_svg.encode('utf-8'),
+                         write_to='resources/icon.png',
+                         output_width=128,
+                         output_height=128)
+        store_in_svg_cache('resources/icon.png', cache_path)
+
+        create_white_menu_bar_icon()
+
+        print("Font Awesome icon created at resources/icon.png")
+    except Exception as e:
+        print(f"Error creating Font Awesome icon: {e}")
+        raise
+
+def create_white_menu_bar_icon():
+    """Create a white menu bar icon"""
+    try:
+        phone_icon_svg = """
+        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512">
+        <path fill="#FFFFFF" d="M164.9 24.6c-7.7-18.6-28-28.5-47.4-23.2l-88 24C12.1 30.2 0 46 0 64C0 311.4 200.6 512 448 512c18 0 33.8-12.1 38.6-29.5l24-88c5.3-19.4-4.6-39.7-23.2-47.4l-96-40c-16.3-6.8-35.2-2.1-46.3 11.6L304.7 368C234.3 334.7 177.3 277.7 144 207.3L193.3 167c13.7-11.2 18.4-30 11.6-46.3l-40-96z"/>
+        </svg>
+        """
+
+        # Reuse an earlier rendering of the same SVG
+        cache_path = svg_cache_path(phone_icon_svg, 22, 22)
+        if os.path.exists(cache_path):
+            shutil.copyfile(cache_path, 'resources/menu_bar_icon.png')
+            print("White menu bar icon restored from cache at resources/menu_bar_icon.png")
+            return
+
+        cairosvg = import_or_install('cairosvg', 'cairosvg')
+
+        # cairosvg always writes RGBA, so the PNG can go straight to disk
+        cairosvg.svg2png(bytestring=phone_icon_svg.encode('utf-8'),
+                         write_to='resources/menu_bar_icon.png',
+                         output_width=22,
+                         output_height=22)
+        store_in_svg_cache('resources/menu_bar_icon.png', cache_path)
+
+        print("White menu bar icon created at resources/menu_bar_icon.png")
+    except Exception as e:
+        print(f"Error creating white menu bar icon: {e}")
+
+def create_simple_icon():
+    """Create a simple icon"""
+    try:
+        Image = import_or_install('PIL.Image', 'Pillow')
+        ImageDraw = import_or_install('PIL.ImageDraw', 'Pillow')
+
+        img = Image.new('RGBA', (128, 128), color=(0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        padding = 16
+
+        draw.rounded_rectangle(
+            [(padding, padding), (128 - padding, 128 - padding)],
+            radius=12,
+            fill=(52, 152, 219)  # Blue color
+        )
+
+        center_x = 128 // 2
+        center_y = 128 // 2
+        circle_radius = 128 // 5
+        draw.ellipse(
+            [(center_x - circle_radius, center_y - circle_radius),
+             (center_x + circle_radius, center_y + circle_radius)],
+            fill=(255, 255, 255)  # White
+        )
+
+        inner_radius = circle_radius // 2
+        draw.ellipse(
+            [(center_x - inner_radius, center_y - inner_radius),
+             (center_x + inner_radius, center_y + inner_radius)],
+            fill=(41, 128, 185)  # Darker blue
+        )
+
+        img.save('resources/icon.png')
+
+        create_white_menu_bar_icon_simple()
+
+        print("Simple icon created at resources/icon.png")
+    except Exception as e:
+        print(f"Error creating simple icon: {e}")
+
+def create_white_menu_bar_icon_simple():
+    """Create a white menu bar icon from the simple icon"""
+    try:
+        Image = import_or_install('PIL.Image', 'Pillow')
+        ImageDraw = import_or_install('PIL.ImageDraw', 'Pillow')
+
+        img = Image.new('RGBA', (22, 22), color=(0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        padding = 2
+
+        draw.rounded_rectangle(
+            [(padding, padding), (22 - padding, 22 - padding)],
+            radius=3,
+            fill=(255, 255, 255)  # White color
+        )
+
+        center_x = 22 // 2
+        center_y = 22 // 2
+        circle_radius = 22 // 6
+        draw.ellipse(
+            [(center_x - circle_radius, center_y - circle_radius),
+             (center_x + circle_radius, center_y + circle_radius)],
+            fill=(0, 0, 0, 0)  # Transparent
+        )
+
+        img.save('resources/menu_bar_icon.png')
+
+        print("White menu bar icon created at resources/menu_bar_icon.png")
+    except Exception as e:
+        print(f"Error creating white menu bar icon: {e}")
@@ -4,6 +4,7 @@ Handles connection to Asterisk PBX, processes events, and manages call notificat
 """
 
 import socket
+import selectors
 import threading
 import time
 import logging
@@ -12,6 +13,75 @@ from queue import Queue, Empty
 
 logger = logging.getLogger('FreePBXPopup.AMIClient')
 
+# Login and logoff sent in one write; the ActionIDs tie each response to its action
+_PROBE_TEMPLATE = (
+    "Action: Login\r\nUsername: {username}\r\nSecret: {secret}\r\nActionID: t1\r\n\r\n"
+    "Action: Logoff\r\nActionID: t2\r\n\r\n"
+)
+
+def probe_login(host, port, username, secret, timeout=10):
+    """
+    Log in to an AMI server and log off again to check the credentials
+
+    Reads are driven by a selector, so each step returns as soon as the server answers.
+
+    Args:
+        host (str): AMI host
+        port (int or str): AMI port
+        username (str): AMI username
+        secret (str): AMI secret
+        timeout (float): Overall time limit in seconds
+
+    Returns:
+        tuple: (ok, message)
+    """
+    deadline = time.monotonic() + timeout
+
+    sock = socket.create_connection((host, int(port)), timeout=timeout)
+    sock.setblocking(False)
+
+    with sock, selectors.DefaultSelector() as selector:
+        selector.register(sock, selectors.EVENT_READ)
+
+        def read_until(buf, terminator):
+            """Read from the socket until the terminator appears in the buffer"""
+            while terminator not in buf:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise socket.timeout("timed out waiting for the server")
+
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise ConnectionError("connection closed by the server")
+                buf += chunk
+            return buf
+
+        def read_response(buf, action_id):
+            """Read messages until the response to an action arrives; returns it and the rest of the buffer"""
+            while True:
+                buf = read_until(buf, b"\r\n\r\n")
+                end = buf.index(b"\r\n\r\n") + 4
+                message, buf = buf[:end], buf[end:]
+                if b"ActionID: " + action_id + b"\r\n" in message:
+                    return message, buf
+
+        # The welcome banner is a single line
+        buf = read_until(b"", b"\r\n")
+        buf = buf[buf.index(b"\r\n") + 2:]
+
+        # Send login and logoff together and wait for the login response
+        sock.sendall(_PROBE_TEMPLATE.format(username=username, secret=secret).encode('utf-8'))
+        response, buf = read_response(buf, b"t1")
+
+        # Check if login was successful; the response is only decoded for the error message
+        if b"Response: Success" not in response:
+            return False, f"Login failed: {response.decode('utf-8', errors='replace')}"
+
+        # Wait for the logoff to be acknowledged
+        read_response(buf, b"t2")
+
+    return True, "Connection successful!"
+
 class AMIClient:
     """Client for connecting to Asterisk Manager Interface using direct socket connection"""
 
@@ -36,6 +106,11 @@ class AMIClient:
         self._reader_thread = None
         self._event_queue = Queue()
         self._event_thread = None
+        # Serialises writes to the socket; the reader thread hands responses
+        # back to callers waiting on their ActionID
+        self._lock = threading.Lock()
+        self._pending_actions = {}
+        self._action_counter = 0
 
         self.active_calls = {}
 
@@ -151,7 +226,8 @@ class AMIClient:
                 action_str += f"{key}: {value}\r\n"
             action_str += "\r\n"
 
-            self.socket.sendall(action_str.encode('utf-8'))
+            with self._lock:
+                self.socket.sendall(action_str.encode('utf-8'))
 
             return self._read_response()
 
@@ -212,7 +288,11 @@ class AMIClient:
                     event_data = buffer[:end_pos + end_len]
                     buffer = buffer[end_pos + end_len:]
 
-                    event = self._parse_event(event_data.decode('utf-8'))
+                    event_str = event_data.decode('utf-8')
+                    if 'ActionID:' in event_str:
+                        self._resolve_action(event_str)
+
+                    event = self._parse_event(event_str)
                     if event:
                         self._event_queue.put(event)
 
@@ -223,6 +303,53 @@ class AMIClient:
 
         logger.info("Event reader thread stopped")
 
+    def _resolve_action(self, response_str):
+        """Hand a response to the caller waiting on its ActionID, if any"""
+        for line in response_str.split('\r\n'):
+            if line.startswith('ActionID:'):
+                action_id = line.split(':', 1)[1].strip()
+                break
+        else:
+            return
+
+        with self._lock:
+            waiter = self._pending_actions.get(action_id)
+            if waiter is not None:
+                waiter[1] = response_str
+        if waiter is not None:
+            waiter[0].set()
+
+    def _ping(self, timeout):
+        """
+        Send a Ping over the live session and wait for the reader thread to see its reply
+
+        Args:
+            timeout (float): Time limit in seconds
+
+        Returns:
+            tuple: (ok, message)
+        """
+        with self._lock:
+            self._action_counter += 1
+            action_id = f"ping-{self._action_counter}"
+            waiter = [threading.Event(), None]
+            self._pending_actions[action_id] = waiter
+
+        try:
+            with self._lock:
+                self.socket.sendall(f"Action: Ping\r\nActionID: {action_id}\r\n\r\n".encode('utf-8'))
+
+            if not waiter[0].wait(timeout):
+                return False, "Connection failed: no reply to Ping"
+
+            response = waiter[1]
+            if 'Response: Success' in response or 'Pong' in response:
+                return True, "Connection successful!"
+            return False, "Connection failed: unexpected reply to Ping"
+        finally:
+            with self._lock:
+                self._pending_actions.pop(action_id, None)
+
     def _parse_event(self, event_str):
         """Parse an event string into a dictionary"""
         event = {}
@@ -346,6 +473,39 @@ class AMIClient:
 
             threading.Timer(5.0, remove_call).start()
 
+    def test_credentials(self, host, port, username, secret, timeout=10):
+        """
+        Check AMI credentials
+
+        When the client has a live session with the same credentials it is pinged;
+        otherwise a separate login is probed.
+
+        Args:
+            host (str): AMI host
+            port (int or str): AMI port
+            username (str): AMI username
+            secret (str): AMI secret
+            timeout (float): Overall time limit in seconds
+
+        Returns:
+            tuple: (ok, message)
+        """
+        ami_settings = self.config.get_ami_settings()
+        configured = (
+            ami_settings.get('host', 'localhost'),
+            str(ami_settings.get('port', 5038)),
+            ami_settings.get('username', 'admin'),
+            ami_settings.get('secret', '')
+        )
+
+        if self.socket and self.connected and (host, str(port), username, secret) == configured:
+            try:
+                return self._ping(timeout)
+            except OSError as e:
+                logger.warning(f"Ping over the live session failed, probing a new login: {e}")
+
+        return probe_login(host, port, username, secret, timeout)
+
     def is_connected(self):
         """Check if the AMI client is connected"""
         return self.connected
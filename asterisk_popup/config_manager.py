@@ -4,11 +4,23 @@ Handles loading, saving, and accessing application configuration settings.
 """
 
 import os
-import json
+import copy
 import logging
+from dataclasses import dataclass, field
+
+from asterisk_popup.json_utils import load_file, dump_file
 
 logger = logging.getLogger('FreePBXPopup.ConfigManager')
 
+@dataclass
+class ConfigSnapshot:
+    """Working copy of the settings sections edited by the preference panels"""
+    ami: dict = field(default_factory=dict)
+    extensions: dict = field(default_factory=dict)
+    notifications: dict = field(default_factory=dict)
+    general: dict = field(default_factory=dict)
+    ui: dict = field(default_factory=dict)
+
 class ConfigManager:
     """Configuration manager for FreePBX Popup"""
 
@@ -57,8 +69,7 @@ class ConfigManager:
 
             # Load config file if it exists
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
+                loaded_config = load_file(self.config_file)
 
                 # Update config with loaded values
                 self._update_dict(self.config, loaded_config)
@@ -79,8 +90,7 @@ class ConfigManager:
                 os.makedirs(self.config_dir)
 
             # Save config to file
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            dump_file(self.config_file, self.config)
 
             logger.info(f"Configuration saved to {self.config_file}")
             return True
@@ -96,6 +106,42 @@ class ConfigManager:
             else:
                 target[key] = value
 
+    def snapshot(self):
+        """
+        Take a working copy of the settings sections
+
+        Returns:
+            ConfigSnapshot: Copy that can be edited without touching the live config
+        """
+        return ConfigSnapshot(
+            ami=copy.deepcopy(self.config.get('ami', {})),
+            extensions=copy.deepcopy(self.config.get('extensions', {})),
+            notifications=copy.deepcopy(self.config.get('notifications', {})),
+            general=copy.deepcopy(self.config.get('general', {})),
+            ui=copy.deepcopy(self.config.get('ui', {}))
+        )
+
+    def commit(self, snapshot):
+        """
+        Apply a snapshot to the config and save it once
+
+        Args:
+            snapshot (ConfigSnapshot): Snapshot to apply
+
+        Returns:
+            bool: True if the config was saved
+        """
+        # Commits run on a save thread; build a new dict and swap it in with one assignment
+        # so readers on other threads never see a half-applied config
+        config = dict(self.config)
+        config['ami'] = copy.deepcopy(snapshot.ami)
+        config['extensions'] = copy.deepcopy(snapshot.extensions)
+        config['notifications'] = copy.deepcopy(snapshot.notifications)
+        config['general'] = copy.deepcopy(snapshot.general)
+        config['ui'] = copy.deepcopy(snapshot.ui)
+        self.config = config
+        return self.save_config()
+
     def get_ami_settings(self):
         """Get AMI settings"""
         return self.config.get('ami', {})
@@ -0,0 +1,148 @@
+"""
+IPC for FreePBX Popup - Inter-process command channel module.
+Passes JSON commands from the menu bar app to window processes over a Unix domain datagram socket.
+"""
+
+import os
+import json
+import socket
+import logging
+import threading
+
+from asterisk_popup.json_utils import loads
+
+logger = logging.getLogger('FreePBXPopup.IPC')
+
+# Commands are small JSON blobs; this comfortably bounds a single datagram
+MAX_COMMAND_SIZE = 65536
+
+def command_socket_path(config_path):
+    """
+    Get the command socket path that belongs to a window config file
+
+    Args:
+        config_path (str): Path to the window's config file
+
+    Returns:
+        str: Path of the Unix domain socket
+    """
+    return f"{config_path}.sock"
+
+def notification_socket_path():
+    """
+    Get the socket path of the shared notification service
+
+    Returns:
+        str: Path of the Unix domain socket
+    """
+    return os.path.join(os.path.expanduser('~/Library/Application Support/FreePBXPopup'), 'notify.sock')
+
+def send_command(socket_path, command):
+    """
+    Send a command to a window process
+
+    Args:
+        socket_path (str): Path of the window's command socket
+        command (dict): Command to send
+
+    Returns:
+        bool: True if the command was delivered to the socket
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(json.dumps(command).encode('utf-8'), socket_path)
+        return True
+    except OSError as e:
+        # The window process is not listening (yet or any more)
+        logger.debug("Failed to send command to %s: %s", socket_path, e)
+        return False
+    finally:
+        sock.close()
+
+class CommandListener:
+    """Receives commands on a Unix domain datagram socket in a background thread"""
+
+    def __init__(self, socket_path, handler):
+        """
+        Initialize command listener
+
+        Args:
+            socket_path (str): Path to bind the command socket to
+            handler (callable): Called with each decoded command dict from the listener thread
+        """
+        self.socket_path = socket_path
+        self.handler = handler
+        self._socket = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Bind the socket and start listening"""
+        # Remove a socket left behind by a previous process
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.socket_path)
+
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+
+        logger.info("Listening for commands on %s", self.socket_path)
+
+    def stop(self):
+        """Stop listening and remove the socket"""
+        self._stop_event.set()
+
+        # Wake the listener thread, which is blocked in recvfrom
+        if self._thread and self._thread.is_alive():
+            wakeup = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                wakeup.sendto(b'', self.socket_path)
+            except OSError:
+                pass
+            finally:
+                wakeup.close()
+            self._thread.join(timeout=1)
+
+        if self._socket:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _listen(self):
+        """Receive commands until stopped"""
+        while not self._stop_event.is_set():
+            try:
+                data, _ = self._socket.recvfrom(MAX_COMMAND_SIZE)
+            except OSError:
+                # Socket closed by stop()
+                break
+
+            if self._stop_event.is_set():
+                break
+
+            if not data:
+                continue
+
+            try:
+                command = loads(data)
+            except ValueError as e:
+                logger.error("Invalid command received: %s", e)
+                continue
+
+            try:
+                self.handler(command)
+            except Exception as e:
+                logger.error("Error handling command: %s", e)
+
+        logger.info("Command listener stopped")
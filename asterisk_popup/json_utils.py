@@ -0,0 +1,52 @@
+"""
+JSON Utils for FreePBX Popup - JSON encoding and decoding helpers.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+try:
+    import orjson as _json
+    _HAVE_ORJSON = True
+except ImportError:
+    import json as _json
+    _HAVE_ORJSON = False
+
+def loads(data):
+    """
+    Decode a JSON document
+
+    Args:
+        data (bytes or str): Encoded JSON document
+
+    Returns:
+        object: Decoded value
+    """
+    return _json.loads(data)
+
+def load_file(path):
+    """
+    Read and decode a JSON file
+
+    Args:
+        path (str): Path to the JSON file
+
+    Returns:
+        object: Decoded value
+    """
+    # Both decoders accept bytes, which skips a separate UTF-8 decode step
+    with open(path, 'rb') as f:
+        return _json.loads(f.read())
+
+def dump_file(path, data):
+    """
+    Encode and write a JSON file, indented for people editing it
+
+    Args:
+        path (str): Path to the JSON file
+        data (object): Value to encode
+    """
+    if _HAVE_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(_json.dumps(data, option=_json.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            _json.dump(data, f, indent=4)
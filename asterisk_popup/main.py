@@ -21,6 +21,7 @@ logging.basicConfig(
 logger = logging.getLogger('FreePBXPopup')
 
 from asterisk_popup.ami_client import AMIClient
+from asterisk_popup.ipc import command_socket_path
 from asterisk_popup.notification_manager import NotificationManager
 from asterisk_popup.ui.menu_bar import MenuBarApp
 
@@ -61,6 +62,11 @@ def main():
                 logger.error("No config file specified for main window")
                 return
 
+            # Per-launch options stay out of the config, which the window's tabs save back
+            options = {'command_socket': command_socket_path(config_file)}
+            if '--tab' in sys.argv[:-1]:
+                options['initial_tab'] = sys.argv[sys.argv.index('--tab') + 1]
+
             logger.info(f"Opening main window with config: {config_file}")
 
             # Import wx here to avoid loading it for the menu bar app
@@ -77,8 +83,8 @@ def main():
             with open(config_file, 'r') as f:
                 config = json.load(f)
 
-            # Create and show the main window
-            window = MainWindow(config)
+            # Create and show the main window; the config is already parsed, so skip the re-read
+            window = MainWindow(options, config_data=config)
             window.Show()
 
             # Start the main loop
@@ -88,65 +94,19 @@ def main():
             logger.error(f"Error opening main window: {e}")
             return
 
-    # Check if this is a request to open a notification window
+    # Check if this is a request to run the notification service
     elif is_notification_launcher:
         try:
-            # Find the config file argument
-            config_file = None
-            call_data_file = None
-
-            for arg in sys.argv:
-                if arg.endswith('.json') and 'call_data' in arg:
-                    call_data_file = arg
-                elif arg.endswith('.json'):
-                    config_file = arg
-
-            if not config_file or not call_data_file:
-                logger.error(f"Missing required files for notification launcher: config={config_file}, call_data={call_data_file}")
-                return
-
-            logger.info(f"Opening notification window with config: {config_file} and call data: {call_data_file}")
+            logger.info("Starting notification service")
 
             # Import wx here to avoid loading it for the menu bar app
-            import wx
-            import json
+            from asterisk_popup.ui.wx.notification_launcher import launch_notification
 
-            # Initialize wx app
-            app = wx.App(False)
-
-            # Import the notification window
-            from asterisk_popup.ui.wx.call_notification_window import CallNotificationWindow
-            from asterisk_popup.config_manager import ConfigManager
-
-            # Load config and call data
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
-
-            with open(call_data_file, 'r') as f:
-                call_data = json.load(f)
-
-            # Create config manager
-            config_manager = ConfigManager()
-            config_manager.config = config_data
-
-            # Create a simple call history manager
-            class SimpleCallHistoryManager:
-                def __init__(self):
-                    pass
-                def add_call(self, _):
-                    pass
-                def get_calls(self, **_):
-                    return []
-
-            # Create and show the notification window
-            window = CallNotificationWindow(call_data, config_manager, SimpleCallHistoryManager())
-            window.Show()
-
-            # Start the main loop
-            app.MainLoop()
+            # Serve notifications until the menu bar app asks the service to quit
+            launch_notification()
             return
         except Exception as e:
-            logger.error(f"Error opening notification window: {e}")
+            logger.error(f"Error running notification service: {e}")
             return
 
     # Create configuration manager
@@ -156,6 +116,9 @@ def main():
     # Create notification manager
     notification_mgr = NotificationManager(config_manager)
 
+    # Load the notification service now rather than when the first call rings
+    notification_mgr.start()
+
     # Create AMI client
     ami_client = AMIClient(
         config_manager,
@@ -180,6 +143,10 @@ def main():
             ami_client.stop()
         except Exception as e:
             logger.error(f"Error stopping AMI client: {e}")
+        try:
+            notification_mgr.stop()
+        except Exception as e:
+            logger.error(f"Error stopping notification service: {e}")
         logger.info("FreePBX Popup Client shutting down")
 
 # Global variable to store the socket instance
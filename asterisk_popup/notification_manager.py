@@ -3,12 +3,23 @@ Notification Manager for FreePBX Popup - Call notification handling module.
 Manages displaying notifications for incoming calls and tracking call status.
 """
 
+import os
+import sys
+import time
 import logging
+import threading
+import subprocess
 import rumps
+from collections import deque
 from datetime import datetime
 
+from asterisk_popup.ipc import notification_socket_path, send_command
+
 logger = logging.getLogger('FreePBXPopup.NotificationManager')
 
+# How long to keep retrying while a freshly started notification service binds its socket
+SERVICE_START_TIMEOUT = 10
+
 class NotificationManager:
     """Notification manager for FreePBX Popup"""
 
@@ -23,6 +34,15 @@ class NotificationManager:
 
         self.active_notifications = {}
 
+        # Notification windows are shown by one long-lived service process, started by start() or on first use
+        self.service_socket_path = notification_socket_path()
+        self._service_process = None
+        self._service_lock = threading.Lock()
+
+        # Messages waiting for the service to come up, delivered in order by a single retry thread
+        self._pending = deque()
+        self._retry_thread = None
+
         self._check_authorization()
 
     def _check_authorization(self):
@@ -49,10 +69,10 @@ class NotificationManager:
             caller_id_name = call_info.get('caller_id_name', 'Unknown')
             channel = call_info.get('channel', '')
 
-            process = self._launch_notification_window(call_info)
+            sent = self._launch_notification_window(call_info)
 
-            if channel and process:
-                self.active_notifications[channel] = process
+            if channel and sent:
+                self.active_notifications[channel] = call_info
 
             logger.info(f"Showing notification for call from {caller_id_name} <{caller_id_num}>")
         except Exception as e:
@@ -70,122 +90,118 @@ class NotificationManager:
             logger.info(f"Call status update for channel {channel}: {status}")
 
             if channel in self.active_notifications:
-                process = self.active_notifications[channel]
-
-                try:
-                    import tempfile
-                    import json
-                    import os
-
-                    status_file = os.path.join(tempfile.gettempdir(), f"call_status_{channel.replace('/', '_')}.json")
-                    with open(status_file, 'w') as f:
-                        json.dump({'channel': channel, 'status': status}, f)
-
-                    logger.info(f"Created status update file at {status_file}")
-                except Exception as e:
-                    logger.error(f"Failed to create status update file: {e}")
+                # The service forwards the status to the call's notification window
+                self._send_to_service({'command': 'call_status', 'channel': channel, 'status': status})
 
                 if status == 'hangup':
-                    if process and process.is_alive():
-                        import threading
-                        def check_and_terminate():
-                            import time
-                            time.sleep(5)
-                            if process.is_alive():
-                                logger.info(f"Terminating notification process for channel {channel}")
-                                process.terminate()
-
-                        threading.Thread(target=check_and_terminate, daemon=True).start()
-
                     del self.active_notifications[channel]
                     logger.info(f"Removed notification for channel {channel} due to {status}")
         except Exception as e:
             logger.error(f"Failed to handle call status update: {e}")
 
     def _launch_notification_window(self, call_info):
-        """Launch notification window in a separate process"""
+        """Hand the call to the notification service, which shows its window"""
         try:
-            import json
-            import tempfile
-            import subprocess
-            import sys
-            import os
-
-            # Create temporary files for the call data and config
             call_info_copy = call_info.copy()
-            config_copy = self.config.config.copy()
 
             if 'timestamp' in call_info_copy and isinstance(call_info_copy['timestamp'], datetime):
                 call_info_copy['timestamp'] = call_info_copy['timestamp'].isoformat()
 
-            # Create a temporary file for the call data
-            call_data_file = tempfile.NamedTemporaryFile(mode='w', suffix='_call_data.json', delete=False)
-            call_data_file.write(json.dumps(call_info_copy))
-            call_data_file.close()
-
-            # Create a temporary file for the config
-            config_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-            config_file.write(json.dumps(config_copy))
-            config_file.close()
-
-            # Launch the notification window using the main script with the notification-launcher flag
-            process = subprocess.Popen([
-                sys.executable,
-                '-m', 'asterisk_popup.main',  # Use the main module directly
-                '--notification-launcher',  # Special flag to indicate this is a notification launcher
-                config_file.name,
-                call_data_file.name
-            ])
-
-            logger.info("Launched notification window in a separate process")
-            return process
+            # The service reads the saved config itself, which keeps each datagram small
+            self._send_to_service(
+                {'command': 'show_call', 'call_info': call_info_copy},
+                on_failure=lambda: self._show_simple_notification(call_info)
+            )
+
+            logger.info("Sent call to notification service")
+            return True
         except Exception as e:
             logger.error(f"Failed to launch notification window: {e}")
             self._show_simple_notification(call_info)
+            return False
 
-    def _run_notification_window(self, call_info, config_data):
-        """Run notification window in a separate process"""
-        try:
-            import sys
-            import os
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            sys.path.insert(0, project_root)
-
-            if 'timestamp' in call_info and isinstance(call_info['timestamp'], str):
-                from datetime import datetime
-                try:
-                    call_info['timestamp'] = datetime.fromisoformat(call_info['timestamp'])
-                except:
-                    call_info['timestamp'] = datetime.now()
-
-            import wx
-            app = wx.App(False)
-
-            from asterisk_popup.ui.wx.call_notification_window import CallNotificationWindow
-            from asterisk_popup.config_manager import ConfigManager
-
-            config_manager = ConfigManager()
-            config_manager.config = config_data
-
-            class SimpleCallHistoryManager:
-                def __init__(self):
-                    pass
-                def add_call(self, _):
-                    pass
-                def get_calls(self, **_):
-                    return []
-
-            CallNotificationWindow(call_info, config_manager, SimpleCallHistoryManager())
-
-            app.MainLoop()
+    def _send_to_service(self, message, on_failure=None):
+        """
+        Send a message to the notification service, starting the service if it is not running
 
-        except Exception as e:
-            import logging
-            logger = logging.getLogger('FreePBXPopup.NotificationWindow')
-            logger.error(f"Error running notification window: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        Args:
+            message (dict): Message to send
+            on_failure (callable, optional): Called if the message could not be delivered
+        """
+        with self._service_lock:
+            # Queue behind earlier undelivered messages so a call_status never overtakes its show_call
+            if not self._pending and send_command(self.service_socket_path, message):
+                return
+
+            self._pending.append((message, on_failure))
+
+            # Nothing is listening yet; start the service unless it is already starting up
+            if self._service_process is None or self._service_process.poll() is not None:
+                self._start_service()
+
+            if self._retry_thread is None:
+                self._retry_thread = threading.Thread(target=self._retry_send, daemon=True)
+                self._retry_thread.start()
+
+    def _retry_send(self):
+        """Deliver queued messages in order once the notification service is listening"""
+        deadline = time.monotonic() + SERVICE_START_TIMEOUT
+
+        while True:
+            with self._service_lock:
+                if not self._pending:
+                    self._retry_thread = None
+                    return
+                message, _ = self._pending[0]
+
+            if send_command(self.service_socket_path, message):
+                with self._service_lock:
+                    self._pending.popleft()
+                continue
+
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+
+        logger.error("Notification service did not start in time")
+        with self._service_lock:
+            failed = list(self._pending)
+            self._pending.clear()
+            self._retry_thread = None
+
+        for _, on_failure in failed:
+            if on_failure:
+                on_failure()
+
+    def _start_service(self):
+        """Start the notification service process"""
+        # Set environment variable to indicate this is a subprocess
+        env = os.environ.copy()
+        env['FREEPBX_POPUP_SUBPROCESS'] = '1'
+
+        # Launch the service using the main script with the notification-launcher flag
+        self._service_process = subprocess.Popen([
+            sys.executable,
+            '-m', 'asterisk_popup.main',  # Use the main module directly
+            '--notification-launcher'  # Special flag to indicate this is the notification service
+        ], env=env)
+
+        logger.info("Started notification service")
+
+    def start(self):
+        """Start the notification service ahead of the first call, so that call does not wait for wx to load"""
+        # A service left running by an earlier session is reused as is
+        if send_command(self.service_socket_path, {'command': 'ping'}):
+            return
+
+        with self._service_lock:
+            if self._service_process is None or self._service_process.poll() is not None:
+                self._start_service()
+
+    def stop(self):
+        """Stop the notification service if this manager started it"""
+        if self._service_process is not None and self._service_process.poll() is None:
+            send_command(self.service_socket_path, {'command': 'quit'})
 
     def _show_simple_notification(self, call_info):
         """Show simple notification as fallback"""
@@ -10,8 +10,11 @@ import rumps
 import json
 import tempfile
 import subprocess
+import shutil
 import sys
 
+from asterisk_popup.ipc import command_socket_path, send_command
+
 logger = logging.getLogger('FreePBXPopup.MenuBarApp')
 
 class MenuBarApp(rumps.App):
@@ -138,14 +141,15 @@ class MenuBarApp(rumps.App):
                 json.dump(self.config.config, temp_file)
                 temp_file_path = temp_file.name
 
-            launcher_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ui', 'wx', 'launcher.py')
+            # Prefer the installed console script; fall back to running the
+            # module so source checkouts without an install keep working
+            launcher = shutil.which('freepbx-wx-launcher')
+            if launcher:
+                command = [launcher]
+            else:
+                command = [sys.executable, '-m', 'asterisk_popup.ui.wx.launcher']
 
-            subprocess.Popen([
-                sys.executable,
-                launcher_path,
-                window_type,
-                temp_file_path
-            ])
+            subprocess.Popen(command + [window_type, temp_file_path])
 
             logger.info(f"Launched {window_type} window in a separate process")
         except Exception as e:
@@ -202,6 +206,7 @@ class MenuBarApp(rumps.App):
 
             # Write the config to a temporary file
             config_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+
             config_file.write(json.dumps(config_data))
             config_file.close()
 
@@ -212,15 +217,19 @@ class MenuBarApp(rumps.App):
             env['FREEPBX_POPUP_SUBPROCESS'] = '1'
 
             # Launch the main window as a separate process using the main script
-            self.main_window_process = subprocess.Popen([
+            command = [
                 sys.executable,
                 '-m', 'asterisk_popup.main',  # Use the main module directly
                 '--window-launcher',  # Special flag to indicate this is a window launcher
                 self.main_window_config_path
-            ], env=env)
+            ]
 
+            # The initial tab is an argument rather than a config key, so it never reaches the saved config;
+            # a show command sent before the window binds its socket would be dropped
             if tab:
-                self._send_command_to_main_window({'command': 'show', 'tab': tab})
+                command += ['--tab', tab]
+
+            self.main_window_process = subprocess.Popen(command, env=env)
 
             atexit.register(self._cleanup_main_window)
 
@@ -232,21 +241,13 @@ class MenuBarApp(rumps.App):
     def _send_command_to_main_window(self, command):
         """Send command to main window"""
         try:
-            import json
-            import os
-
             if not hasattr(self, 'main_window_config_path') or not self.main_window_config_path:
                 logger.error("No config file path for main window")
                 return
 
-            # Create a command file next to the config file
-            command_path = f"{self.main_window_config_path}.command"
-
-            # Write the command to the file
-            with open(command_path, 'w') as f:
-                json.dump(command, f)
-
-            logger.debug(f"Sent command to main window: {command}")
+            # Send the command as a single datagram to the window's socket
+            if send_command(command_socket_path(self.main_window_config_path), command):
+                logger.debug(f"Sent command to main window: {command}")
         except Exception as e:
             logger.error(f"Failed to send command to main window: {e}")
 
@@ -276,11 +277,11 @@ class MenuBarApp(rumps.App):
                 except:
                     pass
 
-            # Clean up the command file
-            command_path = f"{self.main_window_config_path}.command" if hasattr(self, 'main_window_config_path') else None
-            if command_path and os.path.exists(command_path):
+            # Clean up the command socket if the window did not remove it
+            socket_path = command_socket_path(self.main_window_config_path) if getattr(self, 'main_window_config_path', None) else None
+            if socket_path and os.path.exists(socket_path):
                 try:
-                    os.remove(command_path)
+                    os.remove(socket_path)
                 except:
                     pass
 
@@ -10,30 +10,21 @@ import platform
 import os
 from datetime import datetime
 
+from asterisk_popup.ui.wx.theme_manager import is_dark_mode
+
 class AboutPanel(scrolled.ScrolledPanel):
 
     def __init__(self, parent):
         super(AboutPanel, self).__init__(parent)
 
-        self.SetBackgroundColour(wx.Colour(245, 245, 245) if not self._is_dark_mode() else wx.Colour(40, 40, 40))
+        self.SetBackgroundColour(wx.Colour(245, 245, 245) if not is_dark_mode() else wx.Colour(40, 40, 40))
 
         self.create_controls()
 
         self.SetupScrolling(scroll_x=False)
 
-    def _is_dark_mode(self):
-        if platform.system() == 'Darwin':
-            try:
-                import subprocess
-                result = subprocess.run(['defaults', 'read', '-g', 'AppleInterfaceStyle'],
-                                      capture_output=True, text=True)
-                return result.stdout.strip() == 'Dark'
-            except:
-                return False
-        return False
-
     def create_controls(self):
-        is_dark = self._is_dark_mode()
+        is_dark = is_dark_mode()
         text_color = wx.Colour(240, 240, 240) if is_dark else wx.Colour(20, 20, 20)
         link_color = wx.Colour(0, 120, 215)
 
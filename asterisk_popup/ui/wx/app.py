@@ -5,6 +5,7 @@ Handles wxPython application initialization and provides a shared app instance.
 
 import wx
 import logging
+import platform
 import threading
 
 logger = logging.getLogger('FreePBXPopup.WxApp')
@@ -13,6 +14,18 @@ logger = logging.getLogger('FreePBXPopup.WxApp')
 _wx_app = None
 _wx_app_lock = threading.Lock()
 
+def hide_dock_icon():
+    """Run the process as an accessory app so its windows do not add a dock icon"""
+    if platform.system() != 'Darwin':
+        return
+
+    try:
+        from AppKit import NSApplication, NSApplicationActivationPolicyAccessory
+        NSApplication.sharedApplication().setActivationPolicy_(NSApplicationActivationPolicyAccessory)
+        logger.info("Hiding dock icon")
+    except Exception as e:
+        logger.error("Failed to hide dock icon: %s", e)
+
 def get_wx_app():
     """
     Get the wxPython app instance, creating it if necessary
@@ -26,15 +39,9 @@ def get_wx_app():
         if _wx_app is None:
             logger.info("Creating wxPython app")
 
-            # Hide dock icon on macOS
-            import platform
-            if platform.system() == 'Darwin':
-                import objc
-                from Foundation import NSBundle
-                bundle = NSBundle.mainBundle()
-                info = bundle.localizedInfoDictionary() or bundle.infoDictionary()
-                info['LSUIElement'] = '1'  # Set to run as agent (no dock icon)
-
             _wx_app = wx.App(False)
 
+            # Hide dock icon on macOS, now that the app has set up NSApp
+            hide_dock_icon()
+
         return _wx_app
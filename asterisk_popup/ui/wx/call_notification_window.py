@@ -7,12 +7,15 @@ import wx
 import wx.adv
 import logging
 import threading
+import socket
 import time
 import os
 import platform
 from datetime import datetime
 from ctypes import c_void_p
 
+from asterisk_popup.ui.wx.theme_manager import is_dark_mode
+
 logger = logging.getLogger('FreePBXPopup.CallNotificationWindow')
 
 class CallNotificationWindow(wx.Frame):
@@ -68,7 +71,7 @@ class CallNotificationWindow(wx.Frame):
         self.ami_socket = None
 
         # Set background color based on system theme
-        self.is_dark_mode = self._is_dark_mode()
+        self.is_dark_mode = is_dark_mode()
         if self.is_dark_mode:
             self.SetBackgroundColour(wx.Colour(40, 40, 40))
             text_color = wx.Colour(255, 255, 255)
@@ -82,6 +85,10 @@ class CallNotificationWindow(wx.Frame):
         # Create UI
         self._create_ui(text_color)
 
+        # Single re-armable timer for hiding the recording status
+        self._status_hide_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda e: self.recording_status.Hide(), self._status_hide_timer)
+
         # Bind events
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_CLOSE, self.on_close)
@@ -357,21 +364,6 @@ class CallNotificationWindow(wx.Frame):
         image = image.Scale(width, height, wx.IMAGE_QUALITY_HIGH)
         return wx.Bitmap(image)
 
-    def _is_dark_mode(self):
-        """Check if system is in dark mode"""
-        # This is a simple check that works on macOS
-        # A more robust solution would use platform-specific APIs
-        try:
-            if wx.SystemSettings.GetAppearance().IsDark():
-                return True
-        except:
-            pass
-
-        # Fallback: check system color
-        bg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW)
-        brightness = (bg_color.Red() + bg_color.Green() + bg_color.Blue()) / 3
-        return brightness < 128
-
     def _play_notification_sound(self):
         """Play notification sound"""
         try:
@@ -463,11 +455,6 @@ class CallNotificationWindow(wx.Frame):
 
             # Initially the call is not active (ringing state)
             self.timer_display.SetLabel("Ringing...")
-
-            # Start a status check timer to check for status updates
-            self.status_check_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_status_check, self.status_check_timer)
-            self.status_check_timer.Start(1000)  # Check every second
         except Exception as e:
             logger.error(f"Failed to set up call timer: {e}")
 
@@ -482,7 +469,6 @@ class CallNotificationWindow(wx.Frame):
             secret = ami_settings.get('secret', '')
 
             # Create socket connection
-            import socket
             self.ami_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.ami_socket.settimeout(3)  # 3 second timeout
 
@@ -573,45 +559,6 @@ class CallNotificationWindow(wx.Frame):
         except Exception as e:
             logger.error(f"Error updating call timer: {e}")
 
-    def on_status_check(self, event):
-        """Check for status updates from the notification manager"""
-        try:
-            if not self.channel:
-                return
-
-            # Check for status update file
-            import tempfile
-            import json
-            import os
-
-            status_file = os.path.join(tempfile.gettempdir(), f"call_status_{self.channel.replace('/', '_')}.json")
-
-            if os.path.exists(status_file):
-                try:
-                    # Read the status update
-                    with open(status_file, 'r') as f:
-                        status_data = json.load(f)
-
-                    # Delete the file to avoid processing it again
-                    os.unlink(status_file)
-
-                    # Process the status update
-                    if status_data.get('channel') == self.channel:
-                        status = status_data.get('status')
-                        logger.info(f"Received status update: {status}")
-
-                        # Update call status
-                        self._update_call_status(status)
-                except Exception as e:
-                    logger.error(f"Error processing status update: {e}")
-                    # Delete the file to avoid processing it again
-                    try:
-                        os.unlink(status_file)
-                    except:
-                        pass
-        except Exception as e:
-            logger.error(f"Error checking for status updates: {e}")
-
     def on_transfer(self, event):
         """Handle transfer button click"""
         try:
@@ -696,8 +643,8 @@ class CallNotificationWindow(wx.Frame):
         if self.call_timer and self.call_timer.IsRunning():
             self.call_timer.Stop()
 
-        if hasattr(self, 'status_check_timer') and self.status_check_timer.IsRunning():
-            self.status_check_timer.Stop()
+        if self._status_hide_timer.IsRunning():
+            self._status_hide_timer.Stop()
 
         # Close AMI connection
         if self.ami_socket:
@@ -751,28 +698,7 @@ class CallNotificationWindow(wx.Frame):
 
                 # Read response - AMI might send multiple events, so we need to read until we get a response
                 # or until we timeout
-                response = ""
-                start_time = time.time()
-                timeout = 2.0  # 2 second timeout
-
-                # Set socket to non-blocking mode
-                self.ami_socket.setblocking(0)
-
-                try:
-                    while time.time() - start_time < timeout:
-                        try:
-                            chunk = self.ami_socket.recv(1024).decode('utf-8')
-                            if chunk:
-                                response += chunk
-                                if "Response: Success" in response or "Response: Error" in response:
-                                    break
-                            time.sleep(0.1)
-                        except Exception:
-                            # Socket would block, no data available
-                            time.sleep(0.1)
-                finally:
-                    # Set socket back to blocking mode
-                    self.ami_socket.setblocking(1)
+                response = self._read_action_response()
 
                 logger.debug(f"AMI monitor response: {response}")
 
@@ -793,28 +719,7 @@ class CallNotificationWindow(wx.Frame):
 
                 # Read response - AMI might send multiple events, so we need to read until we get a response
                 # or until we timeout
-                response = ""
-                start_time = time.time()
-                timeout = 2.0  # 2 second timeout
-
-                # Set socket to non-blocking mode
-                self.ami_socket.setblocking(0)
-
-                try:
-                    while time.time() - start_time < timeout:
-                        try:
-                            chunk = self.ami_socket.recv(1024).decode('utf-8')
-                            if chunk:
-                                response += chunk
-                                if "Response: Success" in response or "Response: Error" in response:
-                                    break
-                            time.sleep(0.1)
-                        except Exception:
-                            # Socket would block, no data available
-                            time.sleep(0.1)
-                finally:
-                    # Set socket back to blocking mode
-                    self.ami_socket.setblocking(1)
+                response = self._read_action_response()
 
                 logger.debug(f"AMI stop monitor response: {response}")
 
@@ -829,14 +734,52 @@ class CallNotificationWindow(wx.Frame):
                     logger.error(f"Failed to stop recording: {response}")
 
                 # Hide the status after 3 seconds
-                wx.CallLater(3000, self.recording_status.Hide)
+                self._status_hide_timer.Start(3000, oneShot=True)
         except Exception as e:
             logger.error(f"Error toggling recording: {e}")
             self.recording_checkbox.SetValue(False)
             self.recording_status.SetLabel("Recording error")
             self.recording_status.Show()  # Show error status
             # Hide the status after 3 seconds
-            wx.CallLater(3000, self.recording_status.Hide)
+            self._status_hide_timer.Start(3000, oneShot=True)
+
+    def _read_action_response(self, timeout=2.0):
+        """
+        Read from the AMI socket until a Response line arrives or the timeout expires
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            str: Decoded response data
+        """
+        buf = memoryview(bytearray(8192))
+        acc = bytearray()
+        start_time = time.time()
+
+        # Set socket to non-blocking mode
+        self.ami_socket.setblocking(0)
+
+        try:
+            while time.time() - start_time < timeout:
+                try:
+                    n = self.ami_socket.recv_into(buf)
+                    if n == 0:
+                        break
+                    acc.extend(buf[:n])
+                    # Only the tail can contain a newly completed Response line
+                    tail = acc[-(n + 64):]
+                    if b"Response: Success" in tail or b"Response: Error" in tail:
+                        break
+                except BlockingIOError:
+                    # Socket would block, no data available
+                    time.sleep(0.1)
+        finally:
+            # Set socket back to blocking mode
+            self.ami_socket.setblocking(1)
+
+        # Decode once so multi-byte characters split across reads stay intact
+        return bytes(acc).decode('utf-8', errors='replace')
 
     def _set_macos_window_level(self):
         """Set macOS window level to ensure it stays on top and hide dock icon"""
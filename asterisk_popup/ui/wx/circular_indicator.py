@@ -8,6 +8,10 @@ import logging
 
 logger = logging.getLogger('FreePBXPopup.CircularIndicator')
 
+# Darkened border colours keyed by (r, g, b); the app only uses a handful of status colours
+_DARKEN_CACHE = {}
+_DARKEN_CACHE_SIZE = 8
+
 class CircularIndicator(wx.Panel):
     """A simple circular indicator that can be used to show status"""
 
@@ -16,9 +20,16 @@ class CircularIndicator(wx.Panel):
         """Initialize the indicator"""
         super(CircularIndicator, self).__init__(parent, id, pos, size, style)
 
+        if not color.IsOk():
+            color = wx.Colour(255, 0, 0)
+
         self._color = color
+        self._rgba = color.GetRGBA()
+        self._border_pen = wx.Pen(self._darken(color), 1)
 
         self.Bind(wx.EVT_PAINT, self.on_paint)
+        # Everything is drawn in on_paint; skip the extra erase macOS still sends
+        self.Bind(wx.EVT_ERASE_BACKGROUND, lambda e: None)
 
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
 
@@ -26,17 +37,21 @@ class CircularIndicator(wx.Panel):
 
     def set_color(self, color):
         """Set the indicator color"""
-        logger.debug(f"CircularIndicator color changing from {self._color} to {color}")
-
+        # An invalid colour has no meaningful RGBA, so replace it before the fast path
         if not color.IsOk():
             logger.warning(f"Invalid color provided to set_color: {color}")
             color = wx.Colour(255, 0, 0)
 
-        if self._color == color:
-            logger.debug(f"Color unchanged: {color}")
+        # Plain int compare avoids a bridged wx.Colour.__eq__ on the common no-change path
+        rgba = color.GetRGBA()
+        if rgba == self._rgba:
             return
 
+        logger.debug(f"CircularIndicator color changing from {self._color} to {color}")
+
+        self._rgba = rgba
         self._color = color
+        self._border_pen = wx.Pen(self._darken(color), 1)
 
         self.Show(True)
 
@@ -45,6 +60,20 @@ class CircularIndicator(wx.Panel):
 
         logger.debug(f"CircularIndicator updated: visible={self.IsShown()}, color={self._color}")
 
+    @staticmethod
+    def _darken(color):
+        """Return a cached, slightly darker variant of color for the border"""
+        key = (color.Red(), color.Green(), color.Blue())
+        darker = _DARKEN_CACHE.get(key)
+        if darker is not None:
+            return darker
+
+        darker = wx.Colour(max(0, key[0] - 30), max(0, key[1] - 30), max(0, key[2] - 30))
+        if len(_DARKEN_CACHE) >= _DARKEN_CACHE_SIZE:
+            _DARKEN_CACHE.pop(next(iter(_DARKEN_CACHE)))
+        _DARKEN_CACHE[key] = darker
+        return darker
+
     def get_color(self):
         """Get the indicator color"""
         return self._color
@@ -65,19 +94,8 @@ class CircularIndicator(wx.Panel):
             gc.SetBrush(wx.Brush(parent_color))
             gc.DrawRectangle(0, 0, w, h)
 
-            color = self._color
-            if not color.IsOk():
-                color = wx.Colour(255, 0, 0)
-                logger.warning(f"Invalid color detected, using fallback: {color}")
-
-            gc.SetBrush(wx.Brush(color))
-
-            border_color = wx.Colour(
-                max(0, color.Red() - 30),
-                max(0, color.Green() - 30),
-                max(0, color.Blue() - 30)
-            )
-            gc.SetPen(wx.Pen(border_color, 1))
+            gc.SetBrush(wx.Brush(self._color))
+            gc.SetPen(self._border_pen)
 
             diameter = min(w, h) - 2
             x = (w - diameter) / 2
@@ -97,19 +115,8 @@ class CircularIndicator(wx.Panel):
             dc.SetBackground(wx.Brush(parent_color))
             dc.Clear()
 
-            color = self._color
-            if not color.IsOk():
-                color = wx.Colour(255, 0, 0)
-                logger.warning(f"Invalid color detected in DC fallback, using fallback: {color}")
-
-            dc.SetBrush(wx.Brush(color))
-
-            border_color = wx.Colour(
-                max(0, color.Red() - 30),
-                max(0, color.Green() - 30),
-                max(0, color.Blue() - 30)
-            )
-            dc.SetPen(wx.Pen(border_color, 1))
+            dc.SetBrush(wx.Brush(self._color))
+            dc.SetPen(self._border_pen)
 
             diameter = min(w, h) - 2
             x = (w - diameter) // 2
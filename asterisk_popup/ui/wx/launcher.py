@@ -9,8 +9,7 @@ import logging
 import wx
 import importlib
 import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+import traceback
 
 logging.basicConfig(
     level=logging.INFO,
@@ -55,7 +54,6 @@ def launch_window():
 
     except Exception as e:
         logger.error(f"Error launching window: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         sys.exit(1)
 
@@ -6,28 +6,62 @@ Provides a tabbed interface for preferences, settings, and about information.
 import wx
 import logging
 import os
-import threading
 import platform
 from datetime import datetime
 
-from asterisk_popup.ui.wx.theme_manager import ThemeManager
+from asterisk_popup.ami_client import AMIClient
+from asterisk_popup.config_manager import ConfigManager
+from asterisk_popup.ipc import CommandListener
+from asterisk_popup.json_utils import load_file
+from asterisk_popup.notification_manager import NotificationManager
+from asterisk_popup.ui.wx.theme_manager import get_theme_manager
 
 from asterisk_popup.ui.wx.preferences_window import ConnectionPanel, NotificationsPanel, GeneralPanel
 from asterisk_popup.ui.wx.about_panel import AboutPanel
 
 logger = logging.getLogger('FreePBXPopup.MainWindow')
 
+_ICON_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'resources', 'icon.png'))
+
+# Tab names the menu bar app sends that are not tab titles
+_TAB_ALIASES = {'preferences': 'connection'}
+
+# Icon and header logo are loaded lazily (wx.App must exist) and shared across windows
+_ICON_CACHE = {}
+
 class MainWindow(wx.Frame):
     """Main window with tabbed interface for FreePBX Popup"""
 
-    def __init__(self, config):
+    # Theme colours, keyed by class attribute; built on first use since wx.App must exist
+    _PALETTE_RGB = {
+        '_SEPARATOR_DARK': (60, 60, 60),
+        '_SEPARATOR_LIGHT': (200, 200, 200),
+        '_BG_NOTEBOOK_DARK': (40, 40, 40),
+        '_BG_NOTEBOOK_LIGHT': (245, 245, 245),
+        '_BG_STATUS_DARK': (50, 50, 50),
+        '_BG_STATUS_LIGHT': (235, 235, 235),
+        '_FG_STATUS_DARK': (180, 180, 180),
+        '_FG_STATUS_LIGHT': (80, 80, 80),
+        '_FG_VERSION_DARK': (120, 120, 120),
+        '_FG_VERSION_LIGHT': (150, 150, 150),
+        '_BG_HEADER_DARK': (45, 45, 45),
+        '_BG_HEADER_LIGHT': (240, 240, 240),
+        '_FG_TITLE_DARK': (255, 255, 255),
+        '_FG_TITLE_LIGHT': (80, 80, 80),
+        '_FG_CONNECTION_DARK': (200, 200, 200),
+        '_FG_CONNECTION_LIGHT': (80, 80, 80),
+    }
+    _palette_ready = False
+
+    def __init__(self, config, config_data=None):
         """
         Initialize main window
 
         Args:
             config (dict): Configuration dictionary
+            config_data (dict, optional): Already loaded config, skips re-reading the config file
         """
-        width = 500
+        width = 550
         height = 600
 
         super(MainWindow, self).__init__(
@@ -38,103 +72,149 @@ class MainWindow(wx.Frame):
         )
 
         self.config = config
+        self.config_manager = None
         self.ami_client = None
         self.notification_mgr = None
+        self.panel = None
+        self.notebook = None
+        self._page_factories = {}
+        # Working copy of the settings shared by all tabs, and the tab panels built so far
+        self._snapshot = None
+        self._pages = []
+        self.status_bar_text = None
+        self.connection_status = None
+        self.status_indicator = None
+        # Panels and labels coloured from the class palette, recoloured by _apply_theme
+        self._header_panel = None
+        self._title = None
+        self._separator = None
+        self._notebook_container = None
+        self._status_panel = None
+        self._version_text = None
         self.config_path = config.get('config_manager')
-
-        # Import required modules
-        import json
-        import os
-
-        # Load the actual config from the config file if provided
-        if self.config_path and os.path.exists(self.config_path):
+        self.command_socket_path = config.get('command_socket')
+        self._command_listener = None
+        self._last_status = (None, None)
+        # This window's AMI client never connects; the menu bar app pushes its client's status instead
+        self._pushed_status = None
+
+        # Status polling fires on the UI thread, so the handler can touch widgets directly
+        self._status_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_status_tick, self._status_timer)
+        self.Bind(wx.EVT_SHOW, self._on_show)
+
+        # Load the actual config from the config file if the caller has not already done so
+        if config_data is not None:
+            self.config_data = config_data
+        elif self.config_path and os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    self.config_data = json.load(f)
+                self.config_data = load_file(self.config_path)
             except Exception as e:
-                logger.error(f"Failed to load config from {self.config_path}: {e}")
+                logger.error("Failed to load config from %s: %s", self.config_path, e)
                 self.config_data = {}
         else:
             # Use the provided config as is
             self.config_data = config
 
-        # Start command checking timer
-        self._start_command_check_timer()
+        self._create_services()
 
         self._set_icon()
+        self._ensure_palette()
 
-        self.theme_manager = ThemeManager()
+        self.theme_manager = get_theme_manager()
         self.is_dark_mode = self.theme_manager.is_dark_mode
 
-        self.theme_manager.apply_to_window(self)
+        self.theme_manager.register(self)
 
         self._create_ui()
 
+        # Commands sent before the listener is bound are lost, so the launcher passes the initial tab here
+        initial_tab = config.get('initial_tab')
+        if initial_tab:
+            self._select_tab(initial_tab)
+
+        # Build the tab that is showing; the others are built when first selected
+        self._build_page(self.notebook.GetSelection())
+
+        self._start_command_listener()
+
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_SYS_COLOUR_CHANGED, self._on_sys_colour_changed)
 
-        self.SetSize(wx.Size(550, 600))
         self.Center()
 
+    @classmethod
+    def _ensure_palette(cls):
+        """Build the shared theme colours once, after wx.App exists"""
+        if cls._palette_ready:
+            return
+        for name, rgb in cls._PALETTE_RGB.items():
+            setattr(cls, name, wx.Colour(*rgb))
+        cls._palette_ready = True
+
     def _set_icon(self):
         """Set window icon"""
         try:
-            icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'resources', 'icon.png')
-            if os.path.exists(icon_path):
-                icon = wx.Icon(icon_path, wx.BITMAP_TYPE_PNG)
+            if 'icon' not in _ICON_CACHE:
+                _ICON_CACHE['icon'] = wx.Icon(_ICON_PATH, wx.BITMAP_TYPE_PNG) if os.path.exists(_ICON_PATH) else None
+            icon = _ICON_CACHE['icon']
+            if icon is not None:
                 self.SetIcon(icon)
         except Exception as e:
-            logger.error(f"Failed to set icon: {e}")
+            logger.error("Failed to set icon: %s", e)
 
-    def _is_dark_mode(self):
-        """Check if system is in dark mode"""
-        try:
-            if wx.SystemSettings.GetAppearance().IsDark():
-                return True
-        except:
-            pass
+    def _on_sys_colour_changed(self, event):
+        """Switch the shared theme over when the system appearance changes"""
+        event.Skip()
+        self.theme_manager.refresh()
 
-        bg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW)
-        brightness = (bg_color.Red() + bg_color.Green() + bg_color.Blue()) / 3
-        return brightness < 128
+        # Another window may already have refreshed the shared manager, so compare against our own state
+        if self.theme_manager.is_dark_mode != self.is_dark_mode:
+            self.is_dark_mode = self.theme_manager.is_dark_mode
+            self._apply_theme()
 
     def _apply_theme(self):
-        """Apply theme based on system settings"""
-        if self.is_dark_mode:
-            self.SetBackgroundColour(wx.Colour(40, 40, 40))
-            self.SetForegroundColour(wx.Colour(255, 255, 255))
-        else:
-            self.SetBackgroundColour(wx.Colour(240, 240, 240))
-            self.SetForegroundColour(wx.Colour(0, 0, 0))
+        """Colour the window's panels and labels from the palette for the current appearance"""
+        dark = self.is_dark_mode
+
+        # Repaint once after all colours are set
+        self.Freeze()
+        try:
+            # The panel covers the whole frame, so it takes the frame's colour from the shared theme
+            self.panel.SetBackgroundColour(self.theme_manager.bg_color)
+            self._header_panel.SetBackgroundColour(self._BG_HEADER_DARK if dark else self._BG_HEADER_LIGHT)
+            self._title.SetForegroundColour(self._FG_TITLE_DARK if dark else self._FG_TITLE_LIGHT)
+            self.connection_status.SetForegroundColour(self._FG_CONNECTION_DARK if dark else self._FG_CONNECTION_LIGHT)
+            self._separator.SetBackgroundColour(self._SEPARATOR_DARK if dark else self._SEPARATOR_LIGHT)
+
+            notebook_bg = self._BG_NOTEBOOK_DARK if dark else self._BG_NOTEBOOK_LIGHT
+            self._notebook_container.SetBackgroundColour(notebook_bg)
+            self.notebook.SetBackgroundColour(notebook_bg)
+
+            self._status_panel.SetBackgroundColour(self._BG_STATUS_DARK if dark else self._BG_STATUS_LIGHT)
+            self.status_bar_text.SetForegroundColour(self._FG_STATUS_DARK if dark else self._FG_STATUS_LIGHT)
+            self._version_text.SetForegroundColour(self._FG_VERSION_DARK if dark else self._FG_VERSION_LIGHT)
+        finally:
+            self.Thaw()
+            self.Refresh()
 
     def _create_ui(self):
         """Create UI elements"""
         self.panel = wx.Panel(self)
 
-        self.panel.SetBackgroundColour(self.GetBackgroundColour())
-
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
         header_panel = self._create_header_panel()
         main_sizer.Add(header_panel, 0, wx.EXPAND | wx.ALL, 0)
 
-        separator = wx.StaticLine(self.panel)
-        if self.is_dark_mode:
-            separator.SetBackgroundColour(wx.Colour(60, 60, 60))
-        else:
-            separator.SetBackgroundColour(wx.Colour(200, 200, 200))
-        main_sizer.Add(separator, 0, wx.EXPAND)
+        self._separator = wx.StaticLine(self.panel)
+        main_sizer.Add(self._separator, 0, wx.EXPAND)
 
-        notebook_container = wx.Panel(self.panel)
-        if self.is_dark_mode:
-            notebook_container.SetBackgroundColour(wx.Colour(40, 40, 40))
-        else:
-            notebook_container.SetBackgroundColour(wx.Colour(245, 245, 245))
+        notebook_container = self._notebook_container = wx.Panel(self.panel)
         notebook_sizer = wx.BoxSizer(wx.VERTICAL)
 
         self.notebook = wx.Notebook(notebook_container)
 
-        self.notebook.SetBackgroundColour(notebook_container.GetBackgroundColour())
-
         notebook_sizer.Add(self.notebook, 1, wx.EXPAND | wx.ALL, 10)
         notebook_container.SetSizer(notebook_sizer)
 
@@ -143,61 +223,46 @@ class MainWindow(wx.Frame):
         self._create_preferences_tabs()
         self._create_about_tab()
 
-        status_panel = wx.Panel(self.panel)
-        if self.is_dark_mode:
-            status_panel.SetBackgroundColour(wx.Colour(50, 50, 50))
-        else:
-            status_panel.SetBackgroundColour(wx.Colour(235, 235, 235))
+        status_panel = self._status_panel = wx.Panel(self.panel)
         status_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
         self.status_bar_text = wx.StaticText(status_panel, label="Disconnected")
-        if self.is_dark_mode:
-            self.status_bar_text.SetForegroundColour(wx.Colour(180, 180, 180))
-        else:
-            self.status_bar_text.SetForegroundColour(wx.Colour(80, 80, 80))
         status_sizer.Add(self.status_bar_text, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
 
         status_sizer.Add(1, 1, 1, wx.EXPAND)
 
-        version_text = wx.StaticText(status_panel, label="v1.0.0")
-        if self.is_dark_mode:
-            version_text.SetForegroundColour(wx.Colour(120, 120, 120))
-        else:
-            version_text.SetForegroundColour(wx.Colour(150, 150, 150))
-        status_sizer.Add(version_text, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self._version_text = wx.StaticText(status_panel, label="v1.0.0")
+        status_sizer.Add(self._version_text, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
 
         status_panel.SetSizer(status_sizer)
         main_sizer.Add(status_panel, 0, wx.EXPAND)
 
         self.panel.SetSizer(main_sizer)
 
+        self._apply_theme()
+
         self._start_status_update_timer()
 
     def _create_header_panel(self):
         """Create header panel with logo and title"""
-        header_panel = wx.Panel(self.panel)
-
-        if self.is_dark_mode:
-            header_panel.SetBackgroundColour(wx.Colour(45, 45, 45))
-        else:
-            header_panel.SetBackgroundColour(wx.Colour(240, 240, 240))
+        header_panel = self._header_panel = wx.Panel(self.panel)
 
         header_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
-        icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'resources', 'icon.png')
-        if os.path.exists(icon_path):
-            logo = wx.Bitmap(icon_path, wx.BITMAP_TYPE_PNG)
-            logo = self._scale_bitmap(logo, 24, 24)
+        if 'logo24' not in _ICON_CACHE:
+            if os.path.exists(_ICON_PATH):
+                _ICON_CACHE['logo24'] = self._scale_bitmap(wx.Bitmap(_ICON_PATH, wx.BITMAP_TYPE_PNG), 24, 24)
+            else:
+                _ICON_CACHE['logo24'] = None
+        logo = _ICON_CACHE['logo24']
+        if logo is not None:
             logo_ctrl = wx.StaticBitmap(header_panel, bitmap=logo)
             header_sizer.Add(logo_ctrl, 0, wx.LEFT | wx.TOP | wx.BOTTOM | wx.ALIGN_CENTER_VERTICAL, 12)
 
         title_font = wx.Font(13, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
         title = wx.StaticText(header_panel, label="FreePBX Popup")
         title.SetFont(title_font)
-        if self.is_dark_mode:
-            title.SetForegroundColour(wx.Colour(255, 255, 255))
-        else:
-            title.SetForegroundColour(wx.Colour(80, 80, 80))
+        self._title = title
         header_sizer.Add(title, 0, wx.LEFT | wx.TOP | wx.BOTTOM | wx.ALIGN_CENTER_VERTICAL, 12)
 
         header_sizer.Add(1, 1, 1, wx.EXPAND)
@@ -208,14 +273,10 @@ class MainWindow(wx.Frame):
         self.status_indicator = wx.Panel(header_panel, size=(8, 8))
         self.status_indicator.SetBackgroundColour(initial_color)
 
-        logger.debug(f"Created status indicator panel with color: {initial_color}")
+        logger.debug("Created status indicator panel with color: %s", initial_color)
         status_sizer.Add(self.status_indicator, 0, wx.RIGHT | wx.ALIGN_CENTER_VERTICAL, 6)
 
         self.connection_status = wx.StaticText(header_panel, label="Disconnected")
-        if self.is_dark_mode:
-            self.connection_status.SetForegroundColour(wx.Colour(200, 200, 200))
-        else:
-            self.connection_status.SetForegroundColour(wx.Colour(80, 80, 80))
         status_sizer.Add(self.connection_status, 0, wx.ALIGN_CENTER_VERTICAL)
 
         header_sizer.Add(status_sizer, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 12)
@@ -235,68 +296,119 @@ class MainWindow(wx.Frame):
         about_panel = AboutPanel(self.notebook)
         self.notebook.AddPage(about_panel, "About")
 
+    def _create_services(self):
+        """Create the config manager and AMI client used by the status bar and tabs"""
+        # Create config manager
+        if self.config_path:
+            self.config_manager = ConfigManager(self.config_path)
+        else:
+            self.config_manager = ConfigManager()
+            self.config_manager.config = self.config_data
+
+        # Create a pre-configured AMI client
+        self.ami_client = AMIClient(self.config_manager)
+
+        # Show the status the menu bar app had when it launched the window until it pushes an update
+        ami_settings = self.config_data.get('ami_settings', {})
+        if 'connected' in ami_settings:
+            self._pushed_status = {'connected': ami_settings['connected']}
+
+    def reload_config(self, config_data):
+        """
+        Switch to a newly loaded config, discarding unsaved edits in the tabs
+
+        Args:
+            config_data (dict): Config read from the config file
+        """
+        self.config_data = config_data
+        self.config_manager.config = config_data
+
+        # The connection status is left alone; the menu bar's pushes are newer than any flag in the file
+
+        # Tabs that were never opened pick up the new snapshot when they are built
+        self._snapshot = self.config_manager.snapshot()
+        for panel in self._pages:
+            panel.snapshot = self._snapshot
+            panel.load_settings()
+
     def _create_preferences_tabs(self):
-        """Create preferences tabs"""
-        # Import required modules
-        from asterisk_popup.config_manager import ConfigManager
-        from asterisk_popup.ami_client import AMIClient
-        from asterisk_popup.notification_manager import NotificationManager
-
-        # Create config manager if needed
-        if not hasattr(self, 'config_manager'):
-            if hasattr(self, 'config_path') and self.config_path:
-                self.config_manager = ConfigManager(self.config_path)
-            else:
-                self.config_manager = ConfigManager()
-                self.config_manager.config = self.config_data
-
-        # Create AMI client if needed
-        if not hasattr(self, 'ami_client') or not self.ami_client:
-            # Check if we have AMI settings in the config
-            ami_settings = self.config_data.get('ami_settings', {})
-            if ami_settings:
-                # Create a pre-configured AMI client
-                self.ami_client = AMIClient(self.config_manager)
-
-                # If the AMI client is already connected in the main app, set the status
-                if ami_settings.get('connected', False):
-                    self.ami_client.connected = True
-                    self.ami_client.reconnect_attempts = 0
-            else:
-                # Create a regular AMI client
-                self.ami_client = AMIClient(self.config_manager)
+        """Create preferences tabs; each tab's panel is built the first time it is shown"""
+        # One working copy of the settings, shared by all tabs
+        self._snapshot = self.config_manager.snapshot()
+
+        pages = (
+            ("Connection", lambda parent: ConnectionPanel(parent, self.config_manager, self.ami_client, self._snapshot)),
+            ("Notifications", lambda parent: NotificationsPanel(parent, self.config_manager, self._get_notification_manager(), self._snapshot)),
+            ("General", lambda parent: GeneralPanel(parent, self.config_manager, self._snapshot)),
+        )
 
-        # Create notification manager if needed
-        if not hasattr(self, 'notification_mgr') or not self.notification_mgr:
-            self.notification_mgr = NotificationManager(self.config_manager)
+        for title, factory in pages:
+            placeholder = wx.Panel(self.notebook)
+            placeholder.SetSizer(wx.BoxSizer(wx.VERTICAL))
+            self.notebook.AddPage(placeholder, title)
+            self._page_factories[self.notebook.GetPageCount() - 1] = factory
 
-        # Create panels
-        connection_panel = ConnectionPanel(self.notebook, self.config_manager, self.ami_client)
-        self.notebook.AddPage(connection_panel, "Connection")
+        self.notebook.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self._on_page_changed)
 
-        notifications_panel = NotificationsPanel(self.notebook, self.config_manager, self.notification_mgr)
-        self.notebook.AddPage(notifications_panel, "Notifications")
+    def _on_page_changed(self, event):
+        """Build the selected tab's panel on first use"""
+        event.Skip()
+        self._build_page(event.GetSelection())
 
-        general_panel = GeneralPanel(self.notebook, self.config_manager)
-        self.notebook.AddPage(general_panel, "General")
+    def _build_page(self, index):
+        """Build the panel of a preferences tab inside its placeholder, if not built yet"""
+        factory = self._page_factories.pop(index, None)
+        if factory is None:
+            return
+
+        page = self.notebook.GetPage(index)
+        page.Freeze()
+        try:
+            panel = factory(page)
+            self._pages.append(panel)
+            page.GetSizer().Add(panel, 1, wx.EXPAND)
+            page.Layout()
+        finally:
+            page.Thaw()
+
+    def _get_notification_manager(self):
+        """Get the notification manager, creating it on first use"""
+        if self.notification_mgr is None:
+            self.notification_mgr = NotificationManager(self.config_manager)
+        return self.notification_mgr
 
     def _start_status_update_timer(self):
         """Start timer to update status"""
         self._update_status()
+        self._status_timer.Start(5000)
+
+    def _on_status_tick(self, event):
+        """Handle status timer tick"""
+        # The menu bar app keeps the window hidden most of the time; nothing to repaint then
+        if not self.IsShown():
+            return
+
+        self._update_status()
+
+    def _on_show(self, event):
+        """Slow the status timer down while hidden and catch up when shown again"""
+        event.Skip()
+
+        if event.IsShown():
+            self._update_status()
+            self._status_timer.Start(5000)
+        elif self._status_timer.IsRunning():
+            self._status_timer.Start(30000)
 
     def _update_status(self):
         """Update status in status bar and header"""
         try:
-            # Make sure we have an AMI client
-            if not hasattr(self, 'ami_client') or not self.ami_client:
-                # Create AMI client if needed
-                if hasattr(self, 'config_manager'):
-                    from asterisk_popup.ami_client import AMIClient
-                    self.ami_client = AMIClient(self.config_manager)
-
-            if hasattr(self, 'ami_client') and self.ami_client:
+            # Prefer the status pushed by the menu bar app over this window's own, never-connected client
+            status = self._pushed_status
+            if status is None and self.ami_client is not None:
                 status = self.ami_client.get_status()
 
+            if status is not None:
                 if status.get('connected'):
                     status_text = "Connected"
                     status_type = "connected"
@@ -312,138 +424,109 @@ class MainWindow(wx.Frame):
                 status_text = "Initializing"
                 status_type = "initializing"
 
-            indicator_color = self.theme_manager.get_status_indicator(status_type)
+            self._apply_status(status_text, status_type)
+        except Exception as e:
+            logger.error("Failed to update status: %s", e)
+
+    def _apply_status(self, status_text, status_type):
+        """
+        Show a connection status in the status bar and header
+
+        Args:
+            status_text (str): Label to show
+            status_type (str): Status kind used for the indicator colour
+        """
+        # Nothing to repaint if the status has not changed since the last update
+        if (status_text, status_type) == self._last_status:
+            return
+
+        indicator_color = self.theme_manager.get_status_indicator(status_type)
 
-            if hasattr(self, 'status_bar_text'):
+        # Batch the label/colour changes into a single repaint and layout pass
+        self.Freeze()
+        try:
+            if self.status_bar_text is not None:
                 self.status_bar_text.SetLabel(status_text)
 
-            if hasattr(self, 'connection_status'):
+            if self.connection_status is not None:
                 self.connection_status.SetLabel(status_text)
-                if self.is_dark_mode:
-                    self.connection_status.SetForegroundColour(wx.Colour(200, 200, 200))
-                else:
-                    self.connection_status.SetForegroundColour(wx.Colour(80, 80, 80))
 
-            if hasattr(self, 'status_indicator'):
+            if self.status_indicator is not None:
                 self.status_indicator.SetBackgroundColour(indicator_color)
                 self.status_indicator.Refresh()
 
-            if hasattr(self, 'panel'):
+            if self.panel is not None:
                 self.panel.Layout()
 
-        except Exception as e:
-            logger.error(f"Failed to update status: {e}")
-
-        self.status_update_timer = threading.Timer(5.0, self._update_status)
-        self.status_update_timer.daemon = True
-        self.status_update_timer.start()
-
-    def _on_paint_indicator(self, event):
-        """Paint the status indicator as a circle"""
-        dc = wx.PaintDC(self.status_indicator)
-        gc = wx.GraphicsContext.Create(dc)
-
-        if gc:
-            w, h = self.status_indicator.GetSize()
-
-            color = self.status_indicator.GetBackgroundColour()
-
-            gc.SetBrush(wx.Brush(color))
+            # Only remember a status that was fully applied, so a failed update is retried on the next tick
+            self._last_status = (status_text, status_type)
+        finally:
+            self.Thaw()
 
-            gc.DrawEllipse(0, 0, w, h)
+    def _start_command_listener(self):
+        """Start listening for commands from the menu bar app"""
+        if not self.command_socket_path:
+            return
 
-    def _start_command_check_timer(self):
-        """Start timer to check for commands"""
-        self._check_for_commands()
-
-    def _check_for_commands(self):
-        """Check for commands from the menu bar app"""
         try:
-            import json
-            import os
-
-            # Check if we have a config path
-            if hasattr(self, 'config_path') and self.config_path:
-                # Check if there's a command file
-                command_path = f"{self.config_path}.command"
-                if os.path.exists(command_path):
-                    try:
-                        # Read the command
-                        with open(command_path, 'r') as f:
-                            command = json.load(f)
-
-                        # Process the command
-                        self._process_command(command)
-
-                        # Delete the command file
-                        try:
-                            os.remove(command_path)
-                        except:
-                            pass
-                    except Exception as e:
-                        logger.error(f"Failed to process command: {e}")
+            # The listener runs on a background thread; hop to the UI thread for each command
+            self._command_listener = CommandListener(
+                self.command_socket_path,
+                lambda command: wx.CallAfter(self._process_command, command)
+            )
+            self._command_listener.start()
         except Exception as e:
-            logger.error(f"Failed to check for commands: {e}")
+            logger.error("Failed to start command listener: %s", e)
+            self._command_listener = None
+
+    def _select_tab(self, tab):
+        """Select the notebook tab whose title matches tab"""
+        if tab and self.notebook is not None:
+            tab = tab.lower()
+            tab = _TAB_ALIASES.get(tab, tab)
 
-        # Schedule the next check
-        self.command_check_timer = threading.Timer(1.0, self._check_for_commands)
-        self.command_check_timer.daemon = True
-        self.command_check_timer.start()
+            # Find the tab index
+            for i in range(self.notebook.GetPageCount()):
+                if self.notebook.GetPageText(i).lower() == tab:
+                    self.notebook.SetSelection(i)
+                    break
 
     def _process_command(self, command):
         """Process a command from the menu bar app"""
         try:
-            logger.info(f"Processing command: {command}")
+            logger.info("Processing command: %s", command)
 
             if command.get('command') == 'quit':
-                # Close the window
-                wx.CallAfter(self.Close)
+                # Close the window for good, not just hide it
+                self.Close(True)
             elif command.get('command') == 'show':
-                # Show the specified tab
-                tab = command.get('tab')
-                if tab and hasattr(self, 'notebook'):
-                    # Find the tab index
-                    for i in range(self.notebook.GetPageCount()):
-                        if self.notebook.GetPageText(i).lower() == tab.lower():
-                            wx.CallAfter(self.notebook.SetSelection, i)
-                            break
+                # Bring the window back and show the specified tab
+                self.show()
+                self._select_tab(command.get('tab'))
+            elif command.get('command') == 'hide':
+                self.Hide()
             elif command.get('command') == 'update_status':
-                # Update the connection status
-                status = command.get('status', {})
-                status_text = status.get('text', 'Unknown')
-                status_type = status.get('type', 'disconnected')
-
-                # Update the UI with the new status
-                indicator_color = self.theme_manager.get_status_indicator(status_type)
-
-                if hasattr(self, 'status_bar_text'):
-                    wx.CallAfter(self.status_bar_text.SetLabel, status_text)
-
-                if hasattr(self, 'connection_status'):
-                    wx.CallAfter(self.connection_status.SetLabel, status_text)
-                    if self.is_dark_mode:
-                        wx.CallAfter(self.connection_status.SetForegroundColour, wx.Colour(200, 200, 200))
-                    else:
-                        wx.CallAfter(self.connection_status.SetForegroundColour, wx.Colour(80, 80, 80))
-
-                if hasattr(self, 'status_indicator'):
-                    wx.CallAfter(self.status_indicator.SetBackgroundColour, indicator_color)
-                    wx.CallAfter(self.status_indicator.Refresh)
-
-                if hasattr(self, 'panel'):
-                    wx.CallAfter(self.panel.Layout)
+                # The menu bar sends its AMI client's get_status(); keep it so the status timer shows it too
+                self._pushed_status = command.get('status', {})
+                self._update_status()
         except Exception as e:
-            logger.error(f"Failed to process command: {e}")
+            logger.error("Failed to process command: %s", e)
 
     def on_close(self, event):
         """Handle window close event"""
-        if hasattr(self, 'status_update_timer') and self.status_update_timer:
-            self.status_update_timer.cancel()
+        self._status_timer.Stop()
+
+        # Closing from the title bar only hides the window, which keeps listening so the menu bar can show it again
+        if event.CanVeto():
+            event.Veto()
+            self.Hide()
+            return
 
-        if hasattr(self, 'command_check_timer') and self.command_check_timer:
-            self.command_check_timer.cancel()
+        if self._command_listener is not None:
+            self._command_listener.stop()
+            self._command_listener = None
 
-        self.Hide()
+        self.Destroy()
 
     def show(self):
         """Show the window"""
@@ -451,22 +534,20 @@ class MainWindow(wx.Frame):
         self.Raise()
 
         if platform.system() == 'Darwin':
+            # Without PyObjC the window is still shown, just not brought in front of other apps
             try:
                 import AppKit
-                AppKit.NSApplication.sharedApplication().activateIgnoringOtherApps_(True)
             except ImportError:
-                import subprocess
-                try:
-                    subprocess.run(['osascript', '-e', 'tell application "System Events" to set frontmost of process "Python" to true'], check=False)
-                except Exception as e:
-                    logger.error(f"Failed to activate app: {e}")
+                logger.debug("PyObjC not available, not activating the app")
+                return
+            AppKit.NSApplication.sharedApplication().activateIgnoringOtherApps_(True)
 
-def show_main_window(config):
+def show_main_window(config, config_data=None):
     """Show main window"""
     from asterisk_popup.ui.wx.app import get_wx_app
     app = get_wx_app()
 
-    window = MainWindow(config)
+    window = MainWindow(config, config_data=config_data)
     window.show()
 
     return window
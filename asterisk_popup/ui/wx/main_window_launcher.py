@@ -6,16 +6,18 @@ Launches the main application window in a separate process with IPC capabilities
 
 import sys
 import os
-import json
 import logging
 import wx
 import threading
 import tempfile
 import time
 import signal
+import traceback
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from asterisk_popup.ipc import command_socket_path
+from asterisk_popup.json_utils import load_file
+from asterisk_popup.ui.wx.app import hide_dock_icon
+from asterisk_popup.ui.wx.main_window import MainWindow
 
 # Set up logging
 logging.basicConfig(
@@ -23,27 +25,12 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.expanduser('~/Library/Logs/FreePBXPopup.log'))
+        # Opened on the first record rather than at import
+        logging.FileHandler(os.path.expanduser('~/Library/Logs/FreePBXPopup.log'), delay=True)
     ]
 )
 logger = logging.getLogger('FreePBXPopup.MainWindowLauncher')
 
-# Hide dock icon on macOS
-try:
-    import platform
-    if platform.system() == 'Darwin':
-        try:
-            import objc
-            from Foundation import NSBundle
-            bundle = NSBundle.mainBundle()
-            info = bundle.localizedInfoDictionary() or bundle.infoDictionary()
-            info['LSUIElement'] = '1'  # Set to run as agent (no dock icon)
-            logger.info("Hiding dock icon")
-        except Exception as e:
-            logger.error(f"Failed to hide dock icon: {e}")
-except Exception as e:
-    logger.error(f"Error setting up dock icon: {e}")
-
 def run_main_window():
     """Run the main window"""
     try:
@@ -57,172 +44,128 @@ def run_main_window():
 
         # Check if config file exists
         if not os.path.exists(config_path):
-            logger.error(f"Config file not found: {config_path}")
+            logger.error("Config file not found: %s", config_path)
             sys.exit(1)
 
         # Load config
-        with open(config_path, 'r') as f:
-            config_data = json.load(f)
+        config_data = load_file(config_path)
 
         # Create wxPython app
         app = wx.App(False)
 
-        # Import required modules
-        from asterisk_popup.ui.wx.main_window import MainWindow
-        from asterisk_popup.config_manager import ConfigManager
-
-        # Create config manager
-        config_manager = ConfigManager()
-        config_manager.config = config_data
-
-        # Create dummy AMI client and notification manager
-        class DummyAMIClient:
-            def __init__(self):
-                self.status = {'connected': False, 'reconnect_attempts': 0}
-
-            def get_status(self):
-                # Return the current status
-                return self.status
-
-            def update_status(self, new_status):
-                # Update the status
-                self.status = new_status
+        # Hide dock icon on macOS, now that the app has set up NSApp
+        hide_dock_icon()
 
-        class DummyNotificationManager:
-            def show_test_notification(self):
-                wx.MessageBox(
-                    "This is a test notification. In the actual application, this would show a native notification.",
-                    "Test Notification",
-                    wx.OK | wx.ICON_INFORMATION
-                )
-
-        ami_client = DummyAMIClient()
-        notification_mgr = DummyNotificationManager()
-
-        # Create main window
-        window = MainWindow(config_manager, ami_client, notification_mgr)
+        # Create main window from the config we already parsed; it owns the command socket next to the config file
+        window = MainWindow({'command_socket': command_socket_path(config_path)}, config_data=config_data)
         window.Show()
 
-        # Set up IPC for communication with the main app
-        setup_ipc(window, config_path)
+        # Reload the window config when the main app rewrites it
+        observer = setup_ipc(window, config_path)
 
         # Start main loop
         app.MainLoop()
 
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
     except Exception as e:
-        logger.error(f"Error running main window: {e}")
-        import traceback
+        logger.error("Error running main window: %s", e)
         logger.error(traceback.format_exc())
         sys.exit(1)
 
 def setup_ipc(window, config_path):
-    """Set up IPC for communication with the main app"""
-    try:
-        # Create a file watcher thread to monitor the config file
-        def watch_config_file():
-            last_modified = os.path.getmtime(config_path)
+    """
+    Set up IPC for communication with the main app
 
-            while True:
-                try:
-                    # Check if config file has been modified
-                    current_modified = os.path.getmtime(config_path)
+    Commands from the main app are handled by the window's own listener; this only watches the config file.
 
-                    if current_modified > last_modified:
-                        logger.info("Config file modified, reloading...")
-                        last_modified = current_modified
-
-                        # Load config
-                        with open(config_path, 'r') as f:
-                            config_data = json.load(f)
-
-                        # Update config
-                        wx.CallAfter(update_config, window, config_data)
-
-                    # Check for command file
-                    command_path = f"{config_path}.command"
-                    if os.path.exists(command_path):
-                        # Load command
-                        with open(command_path, 'r') as f:
-                            command_data = json.load(f)
-
-                        # Process command
-                        wx.CallAfter(process_command, window, command_data)
-
-                        # Delete command file
-                        os.remove(command_path)
-
-                except Exception as e:
-                    logger.error(f"Error in config watcher: {e}")
-
-                # Sleep for a bit
-                time.sleep(1)
+    Returns:
+        Observer: The running file system observer, or None if it could not be started
+    """
+    try:
+        return _watch_config_file(window, config_path)
+    except Exception as e:
+        logger.error("Error setting up config watcher: %s", e)
+        return None
 
-        # Start watcher thread
-        watcher_thread = threading.Thread(target=watch_config_file, daemon=True)
-        watcher_thread.start()
+def _watch_config_file(window, config_path):
+    """
+    Reload the window config whenever the config file changes
 
-    except Exception as e:
-        logger.error(f"Error setting up IPC: {e}")
+    Returns:
+        Observer: The running file system observer, or None if the polling fallback is used
+    """
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        logger.warning("watchdog not available, falling back to polling the config file")
+        _start_polling_watcher(window, config_path)
+        return None
+
+    # FSEvents reports resolved paths (e.g. /private/var/... for temp files)
+    watched_config = os.path.realpath(config_path)
+
+    class ConfigEventHandler(FileSystemEventHandler):
+        def on_modified(self, event):
+            try:
+                if os.path.realpath(event.src_path) == watched_config:
+                    logger.info("Config file modified, reloading...")
+                    config_data = load_file(config_path)
+                    wx.CallAfter(update_config, window, config_data)
+            except Exception as e:
+                logger.error("Error in config watcher: %s", e)
+
+    # Block on kernel change notifications instead of waking up every second
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(ConfigEventHandler(), os.path.dirname(watched_config), recursive=False)
+    observer.start()
+
+    return observer
+
+def _start_polling_watcher(window, config_path):
+    """Poll the config file once a second when no file system observer is available"""
+    # Create a file watcher thread to monitor the config file
+    def watch_config_file():
+        last_modified = os.path.getmtime(config_path)
+
+        while True:
+            try:
+                # Check if config file has been modified
+                current_modified = os.path.getmtime(config_path)
+
+                if current_modified > last_modified:
+                    logger.info("Config file modified, reloading...")
+                    last_modified = current_modified
+
+                    # Load config
+                    config_data = load_file(config_path)
+
+                    # Update config
+                    wx.CallAfter(update_config, window, config_data)
+
+            except Exception as e:
+                logger.error("Error in config watcher: %s", e)
+
+            # Sleep for a bit
+            time.sleep(1)
+
+    # Start watcher thread
+    watcher_thread = threading.Thread(target=watch_config_file, daemon=True)
+    watcher_thread.start()
 
 def update_config(window, config_data):
     """Update window config"""
     try:
-        # Update config
-        window.config.config = config_data
-
-        # Refresh UI
-        window.Refresh()
+        # The window was built from a plain dict; hand it the new config and let it reload its tabs
+        window.reload_config(config_data)
 
         logger.info("Config updated")
     except Exception as e:
-        logger.error(f"Error updating config: {e}")
-
-def process_command(window, command_data):
-    """Process command from main app"""
-    try:
-        # Get command
-        command = command_data.get('command')
-
-        if command == 'show':
-            # Show window
-            window.Show()
-            window.Raise()
-
-            # Select tab if specified
-            tab = command_data.get('tab')
-            if tab == 'preferences':
-                # Select preferences tab - Connection tab
-                window.notebook.SetSelection(0)
-            elif tab == 'about':
-                # Select about tab
-                window.notebook.SetSelection(3)
-
-            logger.info(f"Showing window with tab: {tab if tab else 'default'}")
-
-        elif command == 'hide':
-            # Hide window
-            window.Hide()
-
-            logger.info("Hiding window")
-
-        elif command == 'quit':
-            # Quit application
-            window.Close(True)
-
-            logger.info("Quitting application")
-
-        elif command == 'update_status':
-            # Update connection status
-            status = command_data.get('status', {})
-            if hasattr(window, 'ami_client') and hasattr(window.ami_client, 'update_status'):
-                window.ami_client.update_status(status)
-                logger.debug(f"Updated connection status: {status}")
-
-        else:
-            logger.warning(f"Unknown command: {command}")
-
-    except Exception as e:
-        logger.error(f"Error processing command: {e}")
+        logger.error("Error updating config: %s", e)
 
 if __name__ == "__main__":
     # Set up signal handlers
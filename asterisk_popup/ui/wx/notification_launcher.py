@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 """
-Launcher for call notification window - Notification process module.
-Launches call notification windows in separate processes.
+Launcher for call notification window - Notification service module.
+Runs a single long-lived wx process that shows a call notification window for each call it is sent.
 """
 
 import sys
-import json
 import logging
 import os
+import traceback
 from datetime import datetime
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import wx
+
+from asterisk_popup.config_manager import ConfigManager
+from asterisk_popup.ipc import CommandListener, notification_socket_path
+from asterisk_popup.ui.wx.app import hide_dock_icon
+from asterisk_popup.ui.wx.call_notification_window import CallNotificationWindow
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,65 +27,134 @@ logging.basicConfig(
 )
 logger = logging.getLogger('FreePBXPopup.NotificationLauncher')
 
-def launch_notification():
-    """Launch call notification window"""
-    try:
-        if len(sys.argv) < 2:
-            logger.error("Not enough arguments")
-            sys.exit(1)
+class SimpleCallHistoryManager:
+    def __init__(self):
+        pass
+    def add_call(self, _):
+        pass
+    def get_calls(self, **_):
+        return []
+
+class NotificationService:
+    """Shows call notification windows for messages received from the main app"""
+
+    def __init__(self, app, config_manager):
+        """
+        Initialize notification service
+
+        Args:
+            app (wx.App): Application running the service
+            config_manager (ConfigManager): Configuration manager instance
+        """
+        self.app = app
+        self.config_manager = config_manager
+        self.call_history = SimpleCallHistoryManager()
+
+        # Open notification windows by channel, for call status updates
+        self.windows = {}
+
+    def handle_message(self, message):
+        """
+        Handle a message from the main app, on the UI thread
+
+        Args:
+            message (dict): Message with a 'command' key
+        """
+        try:
+            command = message.get('command')
+
+            if command == 'show_call':
+                self._show_call(message.get('call_info', {}))
+
+            elif command == 'call_status':
+                self._update_call_status(message.get('channel'), message.get('status'))
+
+            elif command == 'ping':
+                # Sent by the main app to check that the service is running
+                pass
 
-        data_path = sys.argv[1]
+            elif command == 'quit':
+                logger.info("Stopping notification service")
+                for window in self.windows.values():
+                    if window:
+                        window.Close()
+                self.windows.clear()
+                self.app.ExitMainLoop()
 
-        with open(data_path, 'r') as f:
-            data = json.load(f)
+            else:
+                logger.warning(f"Unknown command: {command}")
 
-        call_info = data.get('call_info', {})
-        config_data = data.get('config', {})
+        except Exception as e:
+            logger.error(f"Error handling notification message: {e}")
+            logger.error(traceback.format_exc())
 
+    def _show_call(self, call_info):
+        """Show a notification window for a call"""
         if 'timestamp' in call_info and isinstance(call_info['timestamp'], str):
             try:
                 call_info['timestamp'] = datetime.fromisoformat(call_info['timestamp'])
             except:
                 call_info['timestamp'] = datetime.now()
 
-        import wx
+        # Pick up preferences saved since the previous call
+        self.config_manager.load_config()
+
+        window = CallNotificationWindow(call_info, self.config_manager, self.call_history)
+
+        channel = call_info.get('channel')
+        if channel:
+            self.windows[channel] = window
+
+    def _update_call_status(self, channel, status):
+        """Forward a call status update to the call's notification window"""
+        window = self.windows.get(channel)
+
+        # A destroyed window evaluates as False; the user may have closed it already
+        if not window:
+            self.windows.pop(channel, None)
+            return
+
+        window._update_call_status(status)
+
+        if status == 'hangup':
+            del self.windows[channel]
+
+def launch_notification():
+    """Run the notification service until the main app asks it to quit"""
+    listener = None
+
+    try:
         app = wx.App(False)
 
-        import platform
-        if platform.system() == 'Darwin':
-            try:
-                import objc
-                from Foundation import NSBundle
-                bundle = NSBundle.mainBundle()
-                info = bundle.localizedInfoDictionary() or bundle.infoDictionary()
-                info['LSUIElement'] = '1'
-                logger.info("Hiding dock icon")
-            except Exception as e:
-                logger.error(f"Failed to hide dock icon: {e}")
-
-        from asterisk_popup.ui.wx.call_notification_window import CallNotificationWindow
-        from asterisk_popup.config_manager import ConfigManager
+        # Notification windows come and go; keep running while none are open
+        app.SetExitOnFrameDelete(False)
 
+        hide_dock_icon()
+
+        # Also creates the application support directory the socket lives in
         config_manager = ConfigManager()
-        config_manager.config = config_data
 
-        class SimpleCallHistoryManager:
-            def __init__(self):
-                pass
-            def add_call(self, _):
-                pass
-            def get_calls(self, **_):
-                return []
+        service = NotificationService(app, config_manager)
 
-        window = CallNotificationWindow(call_info, config_manager, SimpleCallHistoryManager())
+        # The listener runs on a background thread; hop to the UI thread for each message
+        listener = CommandListener(
+            notification_socket_path(),
+            lambda message: wx.CallAfter(service.handle_message, message)
+        )
+        listener.start()
+
+        logger.info("Notification service started")
 
         app.MainLoop()
 
     except Exception as e:
-        logger.error(f"Error launching notification: {e}")
-        import traceback
+        logger.error(f"Error running notification service: {e}")
         logger.error(traceback.format_exc())
         sys.exit(1)
 
+    finally:
+        if listener is not None:
+            listener.stop()
+
 if __name__ == "__main__":
     launch_notification()
@@ -4,14 +4,204 @@ Provides user interface for configuring all application settings and preferences
 """
 
 import os
+import re
+import sys
+import copy
+import hashlib
 import logging
+import subprocess
 import wx
 import wx.lib.scrolledpanel as scrolled
 import threading
 import platform
+from concurrent.futures import ThreadPoolExecutor
+
+from asterisk_popup.ami_client import probe_login
 
 logger = logging.getLogger('FreePBXPopup.PreferencesWindow')
 
+# The platform does not change while running
+_PLATFORM_NAME = platform.system()
+_IS_MACOS = _PLATFORM_NAME == 'Darwin'
+
+# Config writes run off the UI thread, one at a time so saves land in order
+_SAVE_POOL = ThreadPoolExecutor(max_workers=1)
+
+# How long save confirmations stay visible
+_INFO_BAR_TIMEOUT_MS = 2000
+
+def _add_info_bar(panel, sizer):
+    """Add a hidden info bar for save confirmations to the top of a settings panel"""
+    info_bar = wx.InfoBar(panel)
+    sizer.Add(info_bar, 0, wx.EXPAND)
+
+    # One timer per bar, restarted by each message so an older message's timeout cannot hide a newer one;
+    # the bar owns it, so it goes away with the panel
+    info_bar.dismiss_timer = wx.Timer(info_bar)
+    info_bar.Bind(wx.EVT_TIMER, lambda event: info_bar.Dismiss(), info_bar.dismiss_timer)
+    return info_bar
+
+def _show_info(info_bar, message, flags=wx.ICON_INFORMATION):
+    """Show a message in an info bar and hide it again after a short while"""
+    info_bar.ShowMessage(message, flags)
+    info_bar.dismiss_timer.StartOnce(_INFO_BAR_TIMEOUT_MS)
+
+def _create_form_sizer(main_sizer):
+    """Add the grid that holds a settings panel's form below its info bar"""
+    form_sizer = wx.GridBagSizer(vgap=8, hgap=8)
+    form_sizer.SetFlexibleDirection(wx.HORIZONTAL)
+    main_sizer.Add(form_sizer, 1, wx.EXPAND | wx.ALL, 10)
+    return form_sizer
+
+def _add_heading(panel, form_sizer, row, label, span):
+    """
+    Add a bold section heading with a rule below it
+
+    Args:
+        panel (wx.Window): Panel the heading belongs to
+        form_sizer (wx.GridBagSizer): Form grid to add the heading to
+        row (int): Grid row of the heading
+        label (str): Heading text
+        span (int): Number of grid columns to span
+
+    Returns:
+        int: Next free grid row
+    """
+    heading = wx.StaticText(panel, label=label)
+    heading.SetFont(heading.GetFont().Bold())
+    form_sizer.Add(heading, pos=(row, 0), span=(1, span), flag=wx.TOP, border=0 if row == 0 else 10)
+    form_sizer.Add(wx.StaticLine(panel), pos=(row + 1, 0), span=(1, span), flag=wx.EXPAND)
+    return row + 2
+
+def _add_field(form_sizer, row, label, control, span=1):
+    """Add a label and its control as one form row"""
+    form_sizer.Add(label, pos=(row, 0), flag=wx.ALIGN_CENTER_VERTICAL)
+    form_sizer.Add(control, pos=(row, 1), span=(1, span), flag=wx.EXPAND)
+
+def _update_value(control, value):
+    """Set a text or spin control's value, skipping the update when it already shows that value"""
+    if control.GetValue() == value:
+        return
+
+    # ChangeValue does not send EVT_TEXT
+    if isinstance(control, wx.TextCtrl):
+        control.ChangeValue(value)
+    else:
+        control.SetValue(value)
+
+def _int_setting(settings, key, default):
+    """Read an integer setting, falling back to the default when a hand-edited config holds something else"""
+    try:
+        return int(settings.get(key, default))
+    except (TypeError, ValueError):
+        logger.warning("Invalid %s in config: %r", key, settings.get(key))
+        return default
+
+def _commit_in_background(config, snapshot, info_bar, message):
+    """Save a copy of the snapshot on the save thread and report the outcome in the info bar once it is done"""
+    future = _SAVE_POOL.submit(config.commit, copy.deepcopy(snapshot))
+
+    def on_done(future):
+        if future.exception() is None and future.result():
+            outcome = (message, wx.ICON_INFORMATION)
+        else:
+            outcome = ("Failed to save settings.", wx.ICON_ERROR)
+
+        # The panel may be gone by the time the save finishes
+        wx.CallAfter(lambda: info_bar and _show_info(info_bar, *outcome))
+
+    future.add_done_callback(on_done)
+
+# Extensions are separated by commas and/or whitespace
+_EXT_RE = re.compile(r'[,\s]+')
+
+# Log levels in the order they appear in the log level choice
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+_LOG_LEVEL_INDEX = {name: index for index, name in enumerate(_LOG_LEVELS)}
+
+# LaunchAgent that starts the application at login
+_LAUNCHD_PLIST_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+    <key>Label</key>
+    <string>com.freepbxpopup</string>
+    <key>ProgramArguments</key>
+    <array>
+        <string>{python}</string>
+        <string>{app}</string>
+    </array>
+    <key>RunAtLoad</key>
+    <true/>
+    <key>KeepAlive</key>
+    <false/>
+    <key>ThrottleInterval</key>
+    <integer>30</integer>
+    <key>StartInterval</key>
+    <integer>300</integer>
+</dict>
+</plist>
+"""
+
+# Label of the LaunchAgent, as given in the plist
+_LAUNCHD_LABEL = 'com.freepbxpopup'
+
+def _apply_launchd_state(enable, plist_path, plist_content=None):
+    """
+    Install and load, or unload and remove, the LaunchAgent
+
+    Runs on the save thread since launchctl can take a while to return.
+
+    Args:
+        enable (bool): Whether the application should start at login
+        plist_path (str): Path of the LaunchAgent plist
+        plist_content (str): Plist to install when enabling
+    """
+    try:
+        if enable:
+            desired = plist_content.encode('utf-8')
+
+            # Saving again with the same plist installed leaves everything as it is
+            if os.path.exists(plist_path):
+                with open(plist_path, 'rb') as f:
+                    current = f.read()
+                if hashlib.blake2b(current, digest_size=16).digest() == hashlib.blake2b(desired, digest_size=16).digest():
+                    logger.info("Login item unchanged: %s", plist_path)
+                    return
+
+            # A loaded agent keeps running the old plist, so unload it before replacing the file
+            listed = subprocess.run(['launchctl', 'list', _LAUNCHD_LABEL], capture_output=True)
+            if listed.returncode == 0 and os.path.exists(plist_path):
+                subprocess.run(['launchctl', 'unload', plist_path], check=False)
+
+            # Create LaunchAgents directory if it doesn't exist
+            os.makedirs(os.path.dirname(plist_path), exist_ok=True)
+
+            # Write plist file
+            with open(plist_path, 'wb') as f:
+                f.write(desired)
+
+            # Load the plist
+            try:
+                subprocess.run(['launchctl', 'load', plist_path], check=True)
+                logger.info("Added application to login items: %s", plist_path)
+            except subprocess.CalledProcessError as e:
+                logger.error("Failed to load plist: %s", e)
+        else:
+            # Remove from login items if plist exists
+            if os.path.exists(plist_path):
+                # Unload the plist
+                subprocess.run(['launchctl', 'unload', plist_path], check=False)
+
+                # Remove the plist file
+                os.remove(plist_path)
+                logger.info("Removed application from login items: %s", plist_path)
+    except Exception as e:
+        logger.error("Failed to update login items: %s", e)
+
+# Closing the preferences window only hides it, so one instance is reused
+_PREFS_WINDOW = None
+
 class PreferencesWindow(wx.Frame):
     """Preferences window for FreePBX Popup"""
 
@@ -35,18 +225,32 @@ class PreferencesWindow(wx.Frame):
         self.ami_client = ami_client
         self.notification_mgr = notification_mgr
 
+        # One working copy of the settings, shared by all tabs
+        self.snapshot = self.config.snapshot()
+
         # Create notebook for tabs
         self.notebook = wx.Notebook(self)
 
-        # Create tabs
-        self.connection_panel = ConnectionPanel(self.notebook, self.config, self.ami_client)
-        self.notifications_panel = NotificationsPanel(self.notebook, self.config, self.notification_mgr)
-        self.general_panel = GeneralPanel(self.notebook, self.config)
+        # Only the Connection tab is built up front; the others are built when first selected
+        self.connection_panel = ConnectionPanel(self.notebook, self.config, self.ami_client, self.snapshot)
+        self.notifications_panel = None
+        self.general_panel = None
 
         # Add tabs to notebook
         self.notebook.AddPage(self.connection_panel, "Connection")
-        self.notebook.AddPage(self.notifications_panel, "Notifications")
-        self.notebook.AddPage(self.general_panel, "General")
+        self._page_factories = {}
+        for title, attr, factory in (
+            ("Notifications", 'notifications_panel',
+             lambda parent: NotificationsPanel(parent, self.config, self.notification_mgr, self.snapshot)),
+            ("General", 'general_panel',
+             lambda parent: GeneralPanel(parent, self.config, self.snapshot)),
+        ):
+            placeholder = wx.Panel(self.notebook)
+            placeholder.SetSizer(wx.BoxSizer(wx.VERTICAL))
+            self.notebook.AddPage(placeholder, title)
+            self._page_factories[self.notebook.GetPageCount() - 1] = (attr, factory)
+
+        self.notebook.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self._on_page_changed)
 
         # Create sizer
         sizer = wx.BoxSizer(wx.VERTICAL)
@@ -59,6 +263,37 @@ class PreferencesWindow(wx.Frame):
         # Bind events
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
+    def _on_page_changed(self, event):
+        """Build the selected tab's panel on first use"""
+        event.Skip()
+
+        entry = self._page_factories.pop(event.GetSelection(), None)
+        if entry is None:
+            return
+
+        attr, factory = entry
+        page = self.notebook.GetPage(event.GetSelection())
+        page.Freeze()
+        try:
+            panel = factory(page)
+            page.GetSizer().Add(panel, 1, wx.EXPAND)
+            page.Layout()
+        finally:
+            page.Thaw()
+
+        setattr(self, attr, panel)
+
+    def reload_from_config(self):
+        """Discard unsaved edits and show the current configuration in every built tab"""
+        self.snapshot = self.config.snapshot()
+
+        # Tabs that were never opened pick up the new snapshot when they are built
+        for panel in (self.connection_panel, self.notifications_panel, self.general_panel):
+            if panel is None:
+                continue
+            panel.snapshot = self.snapshot
+            panel.load_settings()
+
     def on_close(self, event):
         """Handle window close event"""
         self.Hide()
@@ -66,12 +301,13 @@ class PreferencesWindow(wx.Frame):
 class ConnectionPanel(scrolled.ScrolledPanel):
     """Connection settings panel"""
 
-    def __init__(self, parent, config, ami_client):
+    def __init__(self, parent, config, ami_client, snapshot=None):
         """Initialize connection panel"""
         super(ConnectionPanel, self).__init__(parent)
 
         self.config = config
         self.ami_client = ami_client
+        self.snapshot = snapshot if snapshot is not None else config.snapshot()
 
         # Create controls
         self.create_controls()
@@ -87,63 +323,62 @@ class ConnectionPanel(scrolled.ScrolledPanel):
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
-        # Server settings
-        server_box = wx.StaticBox(self, label="Server Settings")
-        server_sizer = wx.StaticBoxSizer(server_box, wx.VERTICAL)
+        # Save confirmations
+        self.info_bar = _add_info_bar(self, main_sizer)
 
-        # Create a grid sizer for better alignment
-        grid_sizer = wx.FlexGridSizer(rows=4, cols=2, vgap=10, hgap=10)
-        grid_sizer.AddGrowableCol(1, 1)
+        # One flat grid for the whole form keeps layout passes cheap
+        form_sizer = _create_form_sizer(main_sizer)
+
+        # Server settings
+        row = _add_heading(self, form_sizer, 0, "Server Settings", 2)
 
         # Host
         host_label = wx.StaticText(self, label="Host:")
         self.host_field = wx.TextCtrl(self)
-        grid_sizer.Add(host_label, 0, wx.ALIGN_CENTER_VERTICAL)
-        grid_sizer.Add(self.host_field, 0, wx.EXPAND)
+        _add_field(form_sizer, row, host_label, self.host_field)
+        row += 1
 
         # Port
         port_label = wx.StaticText(self, label="Port:")
-        self.port_field = wx.TextCtrl(self)
-        grid_sizer.Add(port_label, 0, wx.ALIGN_CENTER_VERTICAL)
-        grid_sizer.Add(self.port_field, 0, wx.EXPAND)
+        self.port_field = wx.SpinCtrl(self, min=1, max=65535, initial=5038)
+        _add_field(form_sizer, row, port_label, self.port_field)
+        row += 1
 
         # Username
         username_label = wx.StaticText(self, label="Username:")
         self.username_field = wx.TextCtrl(self)
-        grid_sizer.Add(username_label, 0, wx.ALIGN_CENTER_VERTICAL)
-        grid_sizer.Add(self.username_field, 0, wx.EXPAND)
+        _add_field(form_sizer, row, username_label, self.username_field)
+        row += 1
 
         # Password
         password_label = wx.StaticText(self, label="Password:")
         self.password_field = wx.TextCtrl(self, style=wx.TE_PASSWORD)
-        grid_sizer.Add(password_label, 0, wx.ALIGN_CENTER_VERTICAL)
-        grid_sizer.Add(self.password_field, 0, wx.EXPAND)
-
-        server_sizer.Add(grid_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        _add_field(form_sizer, row, password_label, self.password_field)
+        row += 1
 
         # Auto connect
         self.auto_connect_checkbox = wx.CheckBox(self, label="Connect automatically on startup")
-        server_sizer.Add(self.auto_connect_checkbox, 0, wx.ALL, 10)
-
-        main_sizer.Add(server_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        form_sizer.Add(self.auto_connect_checkbox, pos=(row, 0), span=(1, 2))
+        row += 1
 
         # Extensions settings
-        extensions_box = wx.StaticBox(self, label="Extensions")
-        extensions_sizer = wx.StaticBoxSizer(extensions_box, wx.VERTICAL)
+        row = _add_heading(self, form_sizer, row, "Extensions", 2)
 
         # Monitor all checkbox
         self.monitor_all_checkbox = wx.CheckBox(self, label="Monitor all extensions")
         self.monitor_all_checkbox.Bind(wx.EVT_CHECKBOX, self.on_monitor_all)
-        extensions_sizer.Add(self.monitor_all_checkbox, 0, wx.ALL, 10)
+        form_sizer.Add(self.monitor_all_checkbox, pos=(row, 0), span=(1, 2))
+        row += 1
 
         # Extensions to monitor
         extensions_label = wx.StaticText(self, label="Extensions to monitor:")
         self.extensions_field = wx.TextCtrl(self)
         self.extensions_field.SetHint("Enter extensions separated by commas")
-        extensions_sizer.Add(extensions_label, 0, wx.ALL, 10)
-        extensions_sizer.Add(self.extensions_field, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+        form_sizer.Add(extensions_label, pos=(row, 0), span=(1, 2))
+        form_sizer.Add(self.extensions_field, pos=(row + 1, 0), span=(1, 2), flag=wx.EXPAND)
+        row += 2
 
-        main_sizer.Add(extensions_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        form_sizer.AddGrowableCol(1)
 
         # Buttons
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -156,26 +391,26 @@ class ConnectionPanel(scrolled.ScrolledPanel):
         self.save_button.Bind(wx.EVT_BUTTON, self.on_save)
         button_sizer.Add(self.save_button)
 
-        main_sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 20)
+        form_sizer.Add(button_sizer, pos=(row, 0), span=(1, 2), flag=wx.ALIGN_RIGHT | wx.TOP, border=10)
 
         self.SetSizer(main_sizer)
 
     def load_settings(self):
         """Load settings from config"""
-        ami_settings = self.config.get_ami_settings()
+        ami_settings = self.snapshot.ami
 
-        self.host_field.SetValue(ami_settings.get('host', 'localhost'))
-        self.port_field.SetValue(str(ami_settings.get('port', 5038)))
-        self.username_field.SetValue(ami_settings.get('username', 'admin'))
-        self.password_field.SetValue(ami_settings.get('secret', ''))
+        _update_value(self.host_field, ami_settings.get('host', 'localhost'))
+        _update_value(self.port_field, _int_setting(ami_settings, 'port', 5038))
+        _update_value(self.username_field, ami_settings.get('username', 'admin'))
+        _update_value(self.password_field, ami_settings.get('secret', ''))
         self.auto_connect_checkbox.SetValue(ami_settings.get('auto_connect', True))
 
         # Extensions settings
-        extensions = self.config.get_extensions_to_monitor()
-        monitor_all = self.config.config.get('extensions', {}).get('monitor_all', True)
+        extensions = self.snapshot.extensions.get('extensions_to_monitor', [])
+        monitor_all = self.snapshot.extensions.get('monitor_all', True)
 
         self.monitor_all_checkbox.SetValue(monitor_all)
-        self.extensions_field.SetValue(', '.join(extensions))
+        _update_value(self.extensions_field, ', '.join(extensions))
         self.extensions_field.Enable(not monitor_all)
 
     def on_monitor_all(self, event):
@@ -194,80 +429,36 @@ class ConnectionPanel(scrolled.ScrolledPanel):
         self.test_button.Disable()
         self.test_button.SetLabel("Testing...")
 
-        # Create progress dialog
-        progress = wx.ProgressDialog(
-            "Testing Connection",
-            f"Testing connection to {host}:{port}...",
-            maximum=100,
-            parent=self,
-            style=wx.PD_APP_MODAL | wx.PD_AUTO_HIDE
-        )
-        progress.Update(0)
+        # The test takes about one round trip, so a busy cursor is enough feedback
+        wx.BeginBusyCursor()
 
         # Run test in a separate thread
         def test_connection():
-            import socket
-            import time
-
+            ok, message = False, ""
             try:
-                # Update progress
-                wx.CallAfter(progress.Update, 10, "Creating socket...")
-
-                # Create socket
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(10)  # 10 second timeout
-
-                # Connect to server
-                wx.CallAfter(progress.Update, 30, f"Connecting to {host}:{port}...")
-                sock.connect((host, int(port)))
-
-                # Read welcome message
-                wx.CallAfter(progress.Update, 50, "Reading welcome message...")
-                welcome = sock.recv(1024).decode('utf-8')
-
-                # Send login command
-                wx.CallAfter(progress.Update, 70, "Sending login command...")
-                login_cmd = f"Action: Login\r\nUsername: {username}\r\nSecret: {password}\r\n\r\n"
-                sock.send(login_cmd.encode('utf-8'))
-
-                # Wait for response
-                time.sleep(1)
-                wx.CallAfter(progress.Update, 90, "Reading response...")
-                response = sock.recv(1024).decode('utf-8')
-
-                # Check if login was successful
-                if "Success" in response:
-                    # Send logoff command
-                    logoff_cmd = "Action: Logoff\r\n\r\n"
-                    sock.send(logoff_cmd.encode('utf-8'))
-
-                    # Wait for response
-                    time.sleep(1)
-                    sock.recv(1024)
-
-                    sock.close()
-
-                    # Show success message
-                    wx.CallAfter(self.show_test_result, True, "Connection successful!")
+                # Reuse the live client's session when it can vouch for these credentials
+                if self.ami_client is not None:
+                    ok, message = self.ami_client.test_credentials(host, port, username, password)
                 else:
-                    sock.close()
-
-                    # Show error message
-                    wx.CallAfter(self.show_test_result, False, f"Login failed: {response}")
+                    ok, message = probe_login(host, port, username, password)
             except Exception as e:
-                # Show error message
-                wx.CallAfter(self.show_test_result, False, f"Connection failed: {e}")
-
-            # Close progress dialog
-            wx.CallAfter(progress.Destroy)
-
-            # Re-enable button
-            wx.CallAfter(self.test_button.Enable)
-            wx.CallAfter(self.test_button.SetLabel, "Test Connection")
+                message = f"Connection failed: {e}"
+            finally:
+                # Hand the result back to the UI thread in one go
+                wx.CallAfter(self._on_test_done, ok, message)
 
         # Start test thread
         threading.Thread(target=test_connection, daemon=True).start()
 
+    def _on_test_done(self, success, message):
+        """Restore the test button and show the test result"""
+        wx.EndBusyCursor()
+
+        self.test_button.Enable()
+        self.test_button.SetLabel("Test Connection")
+
+        self.show_test_result(success, message)
+
     def show_test_result(self, success, message):
         """Show test result"""
         if success:
@@ -288,35 +479,38 @@ class ConnectionPanel(scrolled.ScrolledPanel):
         # Save AMI settings
         ami_settings = {
             'host': self.host_field.GetValue(),
-            'port': int(self.port_field.GetValue()),
+            'port': self.port_field.GetValue(),
             'username': self.username_field.GetValue(),
             'secret': self.password_field.GetValue(),
             'auto_connect': self.auto_connect_checkbox.GetValue(),
         }
-        self.config.set_ami_settings(ami_settings)
+        self.snapshot.ami = ami_settings
 
         # Save extensions settings
         monitor_all = self.monitor_all_checkbox.GetValue()
         extensions_str = self.extensions_field.GetValue()
-        extensions = [ext.strip() for ext in extensions_str.split(',') if ext.strip()]
-        self.config.set_extensions_to_monitor(extensions, monitor_all)
-
-        # Show confirmation
-        wx.MessageBox(
-            "Connection settings have been saved. You may need to restart the application for some changes to take effect.",
-            "Settings Saved",
-            wx.OK | wx.ICON_INFORMATION
+        extensions = list(filter(None, _EXT_RE.split(extensions_str.strip())))
+        self.snapshot.extensions['extensions_to_monitor'] = extensions
+        self.snapshot.extensions['monitor_all'] = monitor_all
+
+        # Write both sections with a single save, off the UI thread
+        _commit_in_background(
+            self.config,
+            self.snapshot,
+            self.info_bar,
+            "Connection settings have been saved. You may need to restart the application for some changes to take effect."
         )
 
 class NotificationsPanel(scrolled.ScrolledPanel):
     """Notifications settings panel"""
 
-    def __init__(self, parent, config, notification_mgr):
+    def __init__(self, parent, config, notification_mgr, snapshot=None):
         """Initialize notifications panel"""
         super(NotificationsPanel, self).__init__(parent)
 
         self.config = config
         self.notification_mgr = notification_mgr
+        self.snapshot = snapshot if snapshot is not None else config.snapshot()
 
         # Create controls
         self.create_controls()
@@ -332,44 +526,45 @@ class NotificationsPanel(scrolled.ScrolledPanel):
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
-        # Notification settings
-        notification_box = wx.StaticBox(self, label="Notification Settings")
-        notification_sizer = wx.StaticBoxSizer(notification_box, wx.VERTICAL)
+        # Save confirmations
+        self.info_bar = _add_info_bar(self, main_sizer)
+
+        # One flat grid for the whole form keeps layout passes cheap
+        form_sizer = _create_form_sizer(main_sizer)
+
+        # Notification settings; the third column holds the browse button
+        row = _add_heading(self, form_sizer, 0, "Notification Settings", 3)
 
         # Sound
-        sound_sizer = wx.BoxSizer(wx.HORIZONTAL)
         sound_label = wx.StaticText(self, label="Sound:")
         self.sound_choice = wx.Choice(self, choices=["Default", "None", "Custom..."])
         self.sound_choice.Bind(wx.EVT_CHOICE, self.on_sound_choice)
-        sound_sizer.Add(sound_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
-        sound_sizer.Add(self.sound_choice, 1)
-        notification_sizer.Add(sound_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        _add_field(form_sizer, row, sound_label, self.sound_choice, span=2)
+        row += 1
 
         # Custom sound
-        custom_sound_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.custom_sound_label = wx.StaticText(self, label="Custom sound:")
         self.custom_sound_field = wx.TextCtrl(self)
         self.browse_sound_button = wx.Button(self, label="...")
         self.browse_sound_button.Bind(wx.EVT_BUTTON, self.on_browse_sound)
-        custom_sound_sizer.Add(self.custom_sound_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
-        custom_sound_sizer.Add(self.custom_sound_field, 1, wx.RIGHT, 5)
-        custom_sound_sizer.Add(self.browse_sound_button, 0)
-        notification_sizer.Add(custom_sound_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        _add_field(form_sizer, row, self.custom_sound_label, self.custom_sound_field)
+        form_sizer.Add(self.browse_sound_button, pos=(row, 2))
+        row += 1
 
         # Auto dismiss
         self.auto_dismiss_checkbox = wx.CheckBox(self, label="Auto-dismiss notifications")
         self.auto_dismiss_checkbox.Bind(wx.EVT_CHECKBOX, self.on_auto_dismiss)
-        notification_sizer.Add(self.auto_dismiss_checkbox, 0, wx.ALL, 5)
+        form_sizer.Add(self.auto_dismiss_checkbox, pos=(row, 0), span=(1, 3))
+        row += 1
 
         # Auto dismiss timeout
-        auto_dismiss_timeout_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.auto_dismiss_timeout_label = wx.StaticText(self, label="Dismiss after (seconds):")
-        self.auto_dismiss_timeout_field = wx.TextCtrl(self, size=(50, -1))
-        auto_dismiss_timeout_sizer.Add(self.auto_dismiss_timeout_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
-        auto_dismiss_timeout_sizer.Add(self.auto_dismiss_timeout_field, 0)
-        notification_sizer.Add(auto_dismiss_timeout_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        self.auto_dismiss_timeout_field = wx.SpinCtrl(self, min=1, max=3600, initial=10, size=(60, -1))
+        form_sizer.Add(self.auto_dismiss_timeout_label, pos=(row, 0), flag=wx.ALIGN_CENTER_VERTICAL)
+        form_sizer.Add(self.auto_dismiss_timeout_field, pos=(row, 1))
+        row += 1
 
-        main_sizer.Add(notification_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        form_sizer.AddGrowableCol(1)
 
         # Buttons
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -382,67 +577,69 @@ class NotificationsPanel(scrolled.ScrolledPanel):
         self.save_button.Bind(wx.EVT_BUTTON, self.on_save)
         button_sizer.Add(self.save_button)
 
-        main_sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+        form_sizer.Add(button_sizer, pos=(row, 0), span=(1, 3), flag=wx.ALIGN_RIGHT | wx.TOP, border=10)
 
         self.SetSizer(main_sizer)
 
     def load_settings(self):
         """Load settings from config"""
-        notifications = self.config.get_notification_settings()
+        notifications = self.snapshot.notifications
 
         # Sound settings
         sound = notifications.get('sound', 'default')
         if sound == 'default':
             self.sound_choice.SetSelection(0)
-            self.custom_sound_label.Show(False)
-            self.custom_sound_field.Show(False)
-            self.browse_sound_button.Show(False)
         elif sound == 'none':
             self.sound_choice.SetSelection(1)
-            self.custom_sound_label.Show(False)
-            self.custom_sound_field.Show(False)
-            self.browse_sound_button.Show(False)
         else:
             self.sound_choice.SetSelection(2)
-            self.custom_sound_label.Show(True)
-            self.custom_sound_field.Show(True)
-            self.browse_sound_button.Show(True)
-            self.custom_sound_field.SetValue(notifications.get('custom_sound_path', ''))
+            _update_value(self.custom_sound_field, notifications.get('custom_sound_path', ''))
 
         # Show missed calls functionality removed
 
         auto_dismiss = notifications.get('auto_dismiss', False)
         self.auto_dismiss_checkbox.SetValue(auto_dismiss)
+        _update_value(self.auto_dismiss_timeout_field, _int_setting(notifications, 'auto_dismiss_timeout', 10))
 
-        self.auto_dismiss_timeout_label.Show(auto_dismiss)
-        self.auto_dismiss_timeout_field.Show(auto_dismiss)
-        self.auto_dismiss_timeout_field.SetValue(str(notifications.get('auto_dismiss_timeout', 10)))
-
-        # Layout update
+        # Show the dependent controls with a single layout pass
+        self.Freeze()
+        try:
+            self._set_custom_sound_visible(sound not in ('default', 'none'))
+            self._set_auto_dismiss_timeout_visible(auto_dismiss)
+        finally:
+            self.Thaw()
         self.Layout()
 
+    def _set_custom_sound_visible(self, visible):
+        """Show or hide the custom sound controls; the caller lays out the panel"""
+        for control in (self.custom_sound_label, self.custom_sound_field, self.browse_sound_button):
+            control.Show(visible)
+
+    def _set_auto_dismiss_timeout_visible(self, visible):
+        """Show or hide the auto-dismiss timeout controls; the caller lays out the panel"""
+        for control in (self.auto_dismiss_timeout_label, self.auto_dismiss_timeout_field):
+            control.Show(visible)
+
     def on_sound_choice(self, event):
         """Handle sound choice"""
         selection = self.sound_choice.GetSelection()
 
-        if selection == 2:  # Custom
-            self.custom_sound_label.Show(True)
-            self.custom_sound_field.Show(True)
-            self.browse_sound_button.Show(True)
-        else:
-            self.custom_sound_label.Show(False)
-            self.custom_sound_field.Show(False)
-            self.browse_sound_button.Show(False)
-
+        self.Freeze()
+        try:
+            self._set_custom_sound_visible(selection == 2)  # Custom
+        finally:
+            self.Thaw()
         self.Layout()
 
     def on_auto_dismiss(self, event):
         """Handle auto dismiss checkbox"""
         auto_dismiss = self.auto_dismiss_checkbox.GetValue()
 
-        self.auto_dismiss_timeout_label.Show(auto_dismiss)
-        self.auto_dismiss_timeout_field.Show(auto_dismiss)
-
+        self.Freeze()
+        try:
+            self._set_auto_dismiss_timeout_visible(auto_dismiss)
+        finally:
+            self.Thaw()
         self.Layout()
 
     def on_browse_sound(self, event):
@@ -480,33 +677,23 @@ class NotificationsPanel(scrolled.ScrolledPanel):
             custom_sound_path = self.custom_sound_field.GetValue()
 
         # Save notification settings
-        notifications = self.config.get_notification_settings()
+        notifications = self.snapshot.notifications
         notifications['sound'] = sound_name
         notifications['custom_sound_path'] = custom_sound_path
         notifications['auto_dismiss'] = self.auto_dismiss_checkbox.GetValue()
+        notifications['auto_dismiss_timeout'] = self.auto_dismiss_timeout_field.GetValue()
 
-        try:
-            notifications['auto_dismiss_timeout'] = int(self.auto_dismiss_timeout_field.GetValue())
-        except ValueError:
-            notifications['auto_dismiss_timeout'] = 10
-
-        self.config.set_notification_settings(notifications)
-
-        # Show confirmation
-        wx.MessageBox(
-            "Notification settings have been saved.",
-            "Settings Saved",
-            wx.OK | wx.ICON_INFORMATION
-        )
+        _commit_in_background(self.config, self.snapshot, self.info_bar, "Notification settings have been saved.")
 
 class GeneralPanel(scrolled.ScrolledPanel):
     """General settings panel"""
 
-    def __init__(self, parent, config):
+    def __init__(self, parent, config, snapshot=None):
         """Initialize general panel"""
         super(GeneralPanel, self).__init__(parent)
 
         self.config = config
+        self.snapshot = snapshot if snapshot is not None else config.snapshot()
 
         # Create controls
         self.create_controls()
@@ -522,6 +709,9 @@ class GeneralPanel(scrolled.ScrolledPanel):
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
+        # Save confirmations
+        self.info_bar = _add_info_bar(self, main_sizer)
+
         # General settings
         general_box = wx.StaticBox(self, label="General Settings")
         general_sizer = wx.StaticBoxSizer(general_box, wx.VERTICAL)
@@ -534,7 +724,7 @@ class GeneralPanel(scrolled.ScrolledPanel):
         # Log level
         log_level_sizer = wx.BoxSizer(wx.HORIZONTAL)
         log_level_label = wx.StaticText(self, label="Log level:")
-        self.log_level_choice = wx.Choice(self, choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.log_level_choice = wx.Choice(self, choices=list(_LOG_LEVELS))
         log_level_sizer.Add(log_level_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
         log_level_sizer.Add(self.log_level_choice, 1)
         general_sizer.Add(log_level_sizer, 0, wx.EXPAND | wx.ALL, 5)
@@ -556,40 +746,24 @@ class GeneralPanel(scrolled.ScrolledPanel):
 
     def load_settings(self):
         """Load settings from config"""
-        general = self.config.get_general_settings()
-        ui = self.config.get_ui_settings()
+        general = self.snapshot.general
 
         self.start_at_login_checkbox.SetValue(general.get('start_at_login', True))
 
         log_level = general.get('log_level', 'INFO')
-        if log_level == 'DEBUG':
-            self.log_level_choice.SetSelection(0)
-        elif log_level == 'INFO':
-            self.log_level_choice.SetSelection(1)
-        elif log_level == 'WARNING':
-            self.log_level_choice.SetSelection(2)
-        elif log_level == 'ERROR':
-            self.log_level_choice.SetSelection(3)
-        else:
-            self.log_level_choice.SetSelection(1)  # Default to INFO
+        self.log_level_choice.SetSelection(_LOG_LEVEL_INDEX.get(log_level, _LOG_LEVEL_INDEX['INFO']))  # Default to INFO
 
     def on_save(self, event):
         """Handle save button"""
         # Save general settings
-        general = self.config.get_general_settings()
+        general = self.snapshot.general
         general['start_at_login'] = self.start_at_login_checkbox.GetValue()
 
         log_level_selection = self.log_level_choice.GetSelection()
-        if log_level_selection == 0:
-            general['log_level'] = 'DEBUG'
-        elif log_level_selection == 1:
-            general['log_level'] = 'INFO'
-        elif log_level_selection == 2:
-            general['log_level'] = 'WARNING'
-        elif log_level_selection == 3:
-            general['log_level'] = 'ERROR'
+        if log_level_selection != wx.NOT_FOUND:
+            general['log_level'] = _LOG_LEVELS[log_level_selection]
 
-        self.config.set_general_settings(general)
+        _commit_in_background(self.config, self.snapshot, self.info_bar, "General settings have been saved.")
 
         # Implement start at login functionality
         start_at_login = self.start_at_login_checkbox.GetValue()
@@ -597,92 +771,41 @@ class GeneralPanel(scrolled.ScrolledPanel):
 
         # Call history functionality removed
 
-        # Show confirmation
-        wx.MessageBox(
-            "General settings have been saved.",
-            "Settings Saved",
-            wx.OK | wx.ICON_INFORMATION
-        )
+    # LaunchAgent location is fixed per user
+    _PLIST_PATH = os.path.join(os.path.expanduser('~/Library/LaunchAgents'), f'{_LAUNCHD_LABEL}.plist')
 
     def _set_start_at_login(self, enable):
         """Set application to start at login"""
         try:
-            import os
-            import subprocess
-            import sys
-
             # Get the path to the application
             app_path = os.path.abspath(sys.argv[0])
 
-            if platform.system() == 'Darwin':
+            if _IS_MACOS:
                 # macOS implementation using launchctl and plist
-                plist_dir = os.path.expanduser('~/Library/LaunchAgents')
-                plist_path = os.path.join(plist_dir, 'com.freepbxpopup.plist')
-
-                if enable:
-                    # Create LaunchAgents directory if it doesn't exist
-                    if not os.path.exists(plist_dir):
-                        os.makedirs(plist_dir)
-
-                    # Create plist file
-                    plist_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>Label</key>
-    <string>com.freepbxpopup</string>
-    <key>ProgramArguments</key>
-    <array>
-        <string>{sys.executable}</string>
-        <string>{app_path}</string>
-    </array>
-    <key>RunAtLoad</key>
-    <true/>
-    <key>KeepAlive</key>
-    <false/>
-    <key>ThrottleInterval</key>
-    <integer>30</integer>
-    <key>StartInterval</key>
-    <integer>300</integer>
-</dict>
-</plist>
-"""
-
-                    # Write plist file
-                    with open(plist_path, 'w') as f:
-                        f.write(plist_content)
+                plist_content = _LAUNCHD_PLIST_TEMPLATE.format(python=sys.executable, app=app_path)
 
-                    # Load the plist
-                    try:
-                        subprocess.run(['launchctl', 'load', plist_path], check=True)
-                        logger.info(f"Added application to login items: {plist_path}")
-                    except subprocess.CalledProcessError as e:
-                        logger.error(f"Failed to load plist: {e}")
-                else:
-                    # Remove from login items if plist exists
-                    if os.path.exists(plist_path):
-                        try:
-                            # Unload the plist
-                            subprocess.run(['launchctl', 'unload', plist_path], check=False)
-
-                            # Remove the plist file
-                            os.remove(plist_path)
-                            logger.info(f"Removed application from login items: {plist_path}")
-                        except Exception as e:
-                            logger.error(f"Failed to remove from login items: {e}")
+                # Queue behind the config write so repeated saves apply in order
+                _SAVE_POOL.submit(_apply_launchd_state, enable, self._PLIST_PATH, plist_content)
             else:
-                logger.warning(f"Start at login not implemented for platform: {platform.system()}")
+                logger.warning(f"Start at login not implemented for platform: {_PLATFORM_NAME}")
         except Exception as e:
             logger.error(f"Failed to set start at login: {e}")
 
 def show_preferences_window(config, ami_client, notification_mgr):
     """Show preferences window"""
+    global _PREFS_WINDOW
+
     # Get wxPython app
     from asterisk_popup.ui.wx.app import get_wx_app
     app = get_wx_app()
 
-    # Create and show window
-    window = PreferencesWindow(config, ami_client, notification_mgr)
-    window.Show()
+    # Create the window once; a destroyed window evaluates as False
+    if _PREFS_WINDOW is None or not _PREFS_WINDOW:
+        _PREFS_WINDOW = PreferencesWindow(config, ami_client, notification_mgr)
+    else:
+        _PREFS_WINDOW.reload_from_config()
+
+    _PREFS_WINDOW.Show()
+    _PREFS_WINDOW.Raise()
 
-    return window
+    return _PREFS_WINDOW
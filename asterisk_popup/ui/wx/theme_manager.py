@@ -4,121 +4,229 @@ Handles theme detection and application of consistent styling across the applica
 """
 
 import wx
+import wx.aui
+import weakref
 import logging
 import platform
+import functools
 
 logger = logging.getLogger('FreePBXPopup.ThemeManager')
 
+# The detected appearance is shared by every window in the process until the system colours change
+@functools.lru_cache(maxsize=1)
+def _detect_dark_mode():
+    """Detect if system is in dark mode"""
+    if platform.system() == 'Darwin':
+        try:
+            from AppKit import NSApplication, NSAppearanceNameAqua, NSAppearanceNameDarkAqua
+            appearance = NSApplication.sharedApplication().effectiveAppearance()
+            best_match = appearance.bestMatchFromAppearancesWithNames_([NSAppearanceNameAqua, NSAppearanceNameDarkAqua])
+            return best_match == NSAppearanceNameDarkAqua
+        except Exception as e:
+            logger.debug(f"Failed to read appearance from AppKit: {e}")
+
+    return wx.SystemSettings.GetAppearance().IsDark()
+
+def is_dark_mode():
+    """
+    Check if system is in dark mode
+
+    Returns:
+        bool: True if the system appearance is dark
+    """
+    return _detect_dark_mode()
+
+# Shared theme manager
+_INSTANCE = None
+
+def get_theme_manager():
+    """
+    Get the shared theme manager, switched over when the system appearance has changed
+
+    Returns:
+        ThemeManager: Theme manager for the current appearance
+    """
+    global _INSTANCE
+    if _INSTANCE is None:
+        _INSTANCE = ThemeManager()
+    elif _INSTANCE.is_dark_mode != is_dark_mode():
+        _INSTANCE.refresh()
+    return _INSTANCE
+
+def invalidate_dark_mode():
+    """Forget the detected appearance so the next check detects it again"""
+    _detect_dark_mode.cache_clear()
+
+# Theme colours as (attribute, RGB); wx.Colour objects are built from these once the app exists
+_DARK_PALETTE = (
+    ('bg_color', (40, 40, 40)),
+    ('fg_color', (230, 230, 230)),
+    ('accent_color', (52, 152, 219)),  # Blue
+    ('header_bg_color', (30, 30, 30)),
+    ('header_fg_color', (230, 230, 230)),
+    ('status_bar_bg_color', (30, 30, 30)),
+    ('status_bar_fg_color', (180, 180, 180)),
+    ('separator_color', (60, 60, 60)),
+    ('button_bg_color', (60, 60, 60)),
+    ('button_fg_color', (230, 230, 230)),
+    ('grid_bg_color', (50, 50, 50)),
+    ('grid_fg_color', (230, 230, 230)),
+    ('grid_line_color', (70, 70, 70)),
+    ('grid_header_bg_color', (60, 60, 60)),
+    ('grid_header_fg_color', (230, 230, 230)),
+    ('grid_selection_bg_color', (70, 130, 180)),  # Steel blue
+    ('grid_selection_fg_color', (255, 255, 255)),
+    ('tab_bg_color', (50, 50, 50)),
+    ('tab_fg_color', (230, 230, 230)),
+    ('tab_active_bg_color', (70, 70, 70)),
+    ('tab_active_fg_color', (255, 255, 255)),
+)
+
+# Light mode buttons use the system colours, which are read on each initialization
+_LIGHT_PALETTE = (
+    ('bg_color', (245, 245, 245)),
+    ('fg_color', (50, 50, 50)),
+    ('accent_color', (52, 152, 219)),  # Blue
+    ('header_bg_color', (235, 235, 235)),
+    ('header_fg_color', (50, 50, 50)),
+    ('status_bar_bg_color', (235, 235, 235)),
+    ('status_bar_fg_color', (80, 80, 80)),
+    ('separator_color', (200, 200, 200)),
+    ('grid_bg_color', (255, 255, 255)),
+    ('grid_fg_color', (50, 50, 50)),
+    ('grid_line_color', (220, 220, 220)),
+    ('grid_header_bg_color', (240, 240, 240)),
+    ('grid_header_fg_color', (50, 50, 50)),
+    ('grid_selection_bg_color', (200, 220, 240)),
+    ('grid_selection_fg_color', (0, 0, 0)),
+    ('tab_bg_color', (235, 235, 235)),
+    ('tab_fg_color', (50, 50, 50)),
+    ('tab_active_bg_color', (255, 255, 255)),
+    ('tab_active_fg_color', (0, 0, 0)),
+)
+
+# Status indicator colours by status type; '_default' covers unknown types
+_STATUS_PALETTE = (
+    ('connected', (0, 200, 0)),  # Green
+    ('reconnecting', (255, 165, 0)),  # Orange
+    ('disconnected', (255, 50, 50)),  # Red
+    ('_default', (100, 100, 100)),  # Gray
+)
+
 class ThemeManager:
     """Theme manager for FreePBX Popup"""
 
+    # Fixed attribute set: the appearance flag, themed widgets and one slot per palette colour
+    __slots__ = ('is_dark_mode', '_subscribers') + tuple(name for name, _ in _DARK_PALETTE)
+
+    # Palettes of wx.Colour objects, built on first use since wx.Colour needs a wx.App
+    _DARK = None
+    _LIGHT = None
+    _STATUS_COLOURS = None
+
+    @classmethod
+    def _ensure_palettes(cls):
+        """Build the dark and light palettes once"""
+        if cls._DARK is None:
+            cls._DARK = {name: wx.Colour(*rgb) for name, rgb in _DARK_PALETTE}
+            cls._LIGHT = {name: wx.Colour(*rgb) for name, rgb in _LIGHT_PALETTE}
+            cls._STATUS_COLOURS = {status: wx.Colour(*rgb) for status, rgb in _STATUS_PALETTE}
+
     def __init__(self):
         """Initialize theme manager"""
-        self.is_dark_mode = self._detect_dark_mode()
-
- 
-        if self.is_dark_mode:
-            # Dark mode colors
-            self.bg_color = wx.Colour(40, 40, 40)
-            self.fg_color = wx.Colour(230, 230, 230)
-            self.accent_color = wx.Colour(52, 152, 219)  # Blue
-            self.header_bg_color = wx.Colour(30, 30, 30)
-            self.header_fg_color = wx.Colour(230, 230, 230)
-            self.status_bar_bg_color = wx.Colour(30, 30, 30)
-            self.status_bar_fg_color = wx.Colour(180, 180, 180)
-            self.separator_color = wx.Colour(60, 60, 60)
-            self.button_bg_color = wx.Colour(60, 60, 60)
-            self.button_fg_color = wx.Colour(230, 230, 230)
-            self.grid_bg_color = wx.Colour(50, 50, 50)
-            self.grid_fg_color = wx.Colour(230, 230, 230)
-            self.grid_line_color = wx.Colour(70, 70, 70)
-            self.grid_header_bg_color = wx.Colour(60, 60, 60)
-            self.grid_header_fg_color = wx.Colour(230, 230, 230)
-            self.grid_selection_bg_color = wx.Colour(70, 130, 180)  # Steel blue
-            self.grid_selection_fg_color = wx.Colour(255, 255, 255)
-            self.tab_bg_color = wx.Colour(50, 50, 50)
-            self.tab_fg_color = wx.Colour(230, 230, 230)
-            self.tab_active_bg_color = wx.Colour(70, 70, 70)
-            self.tab_active_fg_color = wx.Colour(255, 255, 255)
-        else:
-            # Light mode colors
-            self.bg_color = wx.Colour(245, 245, 245)
-            self.fg_color = wx.Colour(50, 50, 50)
-            self.accent_color = wx.Colour(52, 152, 219)  # Blue
-            self.header_bg_color = wx.Colour(235, 235, 235)
-            self.header_fg_color = wx.Colour(50, 50, 50)
-            self.status_bar_bg_color = wx.Colour(235, 235, 235)
-            self.status_bar_fg_color = wx.Colour(80, 80, 80)
-            self.separator_color = wx.Colour(200, 200, 200)
+        # Widgets to theme again when the appearance changes, mapped to their apply_to_* kind
+        self._subscribers = weakref.WeakKeyDictionary()
+
+        self._load_palette()
+
+        logger.info(f"Theme initialized: {'Dark' if self.is_dark_mode else 'Light'} mode")
+
+    def _load_palette(self):
+        """Switch to the palette for the current appearance"""
+        self.is_dark_mode = is_dark_mode()
+
+        self._ensure_palettes()
+        for name, colour in (self._DARK if self.is_dark_mode else self._LIGHT).items():
+            setattr(self, name, colour)
+
+        if not self.is_dark_mode:
             self.button_bg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNFACE)
             self.button_fg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNTEXT)
-            self.grid_bg_color = wx.Colour(255, 255, 255)
-            self.grid_fg_color = wx.Colour(50, 50, 50)
-            self.grid_line_color = wx.Colour(220, 220, 220)
-            self.grid_header_bg_color = wx.Colour(240, 240, 240)
-            self.grid_header_fg_color = wx.Colour(50, 50, 50)
-            self.grid_selection_bg_color = wx.Colour(200, 220, 240)
-            self.grid_selection_fg_color = wx.Colour(0, 0, 0)
-            self.tab_bg_color = wx.Colour(235, 235, 235)
-            self.tab_fg_color = wx.Colour(50, 50, 50)
-            self.tab_active_bg_color = wx.Colour(255, 255, 255)
-            self.tab_active_fg_color = wx.Colour(0, 0, 0)
 
-        logger.info(f"Theme initialized: {'Dark' if self.is_dark_mode else 'Light'} mode")
+    def register(self, widget, kind='window'):
+        """
+        Theme a widget now and again whenever the appearance changes
 
-    def _detect_dark_mode(self):
-        """Detect if system is in dark mode"""
-        try:
-            if wx.SystemSettings.GetAppearance().IsDark():
-                return True
-        except:
-            pass
+        Args:
+            widget (wx.Window): Widget to theme
+            kind (str): 'window', 'grid' or 'notebook', selecting the apply_to_* method
+        """
+        self._subscribers[widget] = kind
+        getattr(self, f'apply_to_{kind}')(widget)
 
-        bg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW)
-        brightness = (bg_color.Red() + bg_color.Green() + bg_color.Blue()) / 3
-        return brightness < 128
+    def refresh(self):
+        """Detect the appearance again and re-theme registered widgets if it changed"""
+        was_dark = self.is_dark_mode
+        invalidate_dark_mode()
+        self._load_palette()
+
+        if self.is_dark_mode == was_dark:
+            return
+
+        logger.info(f"Theme switched to {'Dark' if self.is_dark_mode else 'Light'} mode")
+
+        for widget, kind in list(self._subscribers.items()):
+            # A destroyed widget evaluates as False
+            if widget:
+                getattr(self, f'apply_to_{kind}')(widget)
 
     def apply_to_window(self, window):
         """Apply theme to a window"""
-        window.SetBackgroundColour(self.bg_color)
-        window.SetForegroundColour(self.fg_color)
+        # Repaint once after all colours are set
+        window.Freeze()
+        try:
+            window.SetBackgroundColour(self.bg_color)
+            window.SetForegroundColour(self.fg_color)
+        finally:
+            window.Thaw()
+            window.Refresh(False)
 
     def apply_to_grid(self, grid):
         """Apply theme to a grid"""
-        
-        grid.SetDefaultCellBackgroundColour(self.grid_bg_color)
-        grid.SetDefaultCellTextColour(self.grid_fg_color)
-        grid.SetLabelBackgroundColour(self.grid_header_bg_color)
-        grid.SetLabelTextColour(self.grid_header_fg_color)
-        grid.SetGridLineColour(self.grid_line_color)
+        # Repaint once after all colours are set; the batch also holds back the grid's own refreshes
+        grid.Freeze()
+        grid.BeginBatch()
+        try:
+            grid.SetDefaultCellBackgroundColour(self.grid_bg_color)
+            grid.SetDefaultCellTextColour(self.grid_fg_color)
+            grid.SetLabelBackgroundColour(self.grid_header_bg_color)
+            grid.SetLabelTextColour(self.grid_header_fg_color)
+            grid.SetGridLineColour(self.grid_line_color)
 
-        grid.SetSelectionBackground(self.grid_selection_bg_color)
-        grid.SetSelectionForeground(self.grid_selection_fg_color)
+            grid.SetSelectionBackground(self.grid_selection_bg_color)
+            grid.SetSelectionForeground(self.grid_selection_fg_color)
+        finally:
+            grid.EndBatch()
+            grid.Thaw()
+            grid.Refresh(False)
 
     def apply_to_notebook(self, notebook):
         """Apply theme to a notebook"""
-        notebook.SetBackgroundColour(self.bg_color)
-        notebook.SetForegroundColour(self.fg_color)
-
+        # Repaint once after all colours are set
+        notebook.Freeze()
         try:
-            art = notebook.GetArtProvider()
-
-            if hasattr(art, 'SetColour'):
-                art.SetColour(wx.aui.AUI_DOCKART_BACKGROUND_COLOUR, self.bg_color)
-                art.SetColour(wx.aui.AUI_DOCKART_INACTIVE_CAPTION_COLOUR, self.tab_bg_color)
-                art.SetColour(wx.aui.AUI_DOCKART_INACTIVE_CAPTION_TEXT_COLOUR, self.tab_fg_color)
-                art.SetColour(wx.aui.AUI_DOCKART_ACTIVE_CAPTION_COLOUR, self.tab_active_bg_color)
-                art.SetColour(wx.aui.AUI_DOCKART_ACTIVE_CAPTION_TEXT_COLOUR, self.tab_active_fg_color)
-        except Exception as e:
-            logger.error(f"Failed to set notebook colors: {e}")
+            notebook.SetBackgroundColour(self.bg_color)
+            notebook.SetForegroundColour(self.fg_color)
+
+            # Only AUI notebooks have a tab art provider to colour
+            if isinstance(notebook, wx.aui.AuiNotebook):
+                art = notebook.GetArtProvider()
+                art.SetColour(self.tab_bg_color)
+                art.SetActiveColour(self.tab_active_bg_color)
+        finally:
+            notebook.Thaw()
+            notebook.Refresh(False)
 
     def get_status_indicator(self, status):
         """Get color for status indicator"""
-        if status == "connected":
-            return wx.Colour(0, 200, 0)  # Green
-        elif status == "reconnecting":
-            return wx.Colour(255, 165, 0)  # Orange
-        elif status == "disconnected":
-            return wx.Colour(255, 50, 50)  # Red
-        else:
-            return wx.Colour(100, 100, 100)  # Gray
+        return self._STATUS_COLOURS.get(status, self._STATUS_COLOURS['_default'])
@@ -10,16 +10,20 @@ import subprocess
 import platform
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 def run_command(command, check=True):
     """Run a shell command and print output"""
     print(f"Running: {' '.join(command)}")
-    result = subprocess.run(command, check=check, capture_output=True, text=True)
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(result.stderr, file=sys.stderr)
-    return result
+    
+    # Stream output as it arrives instead of holding it all until the command exits
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1) as process:
+        for line in process.stdout:
+            print(line, end='')
+    
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return subprocess.CompletedProcess(command, process.returncode)
 
 def install_dependencies():
     """Install required dependencies"""
@@ -53,15 +57,23 @@ def create_icns_file():
         shutil.rmtree(iconset_path)
     iconset_path.mkdir(exist_ok=True)
     
-    # Generate different icon sizes
+    # Generate different icon sizes from a single decode of the source image
+    from PIL import Image
+    with Image.open(icon_path) as src:
+        src.load()
+    
     icon_sizes = [16, 32, 64, 128, 256, 512, 1024]
-    for size in icon_sizes:
-        run_command(["sips", "-z", str(size), str(size), str(icon_path), "--out", 
-                    f"{iconset_path}/icon_{size}x{size}.png"], check=False)
-        # Create 2x versions
-        if size <= 512:
-            run_command(["sips", "-z", str(size*2), str(size*2), str(icon_path), "--out", 
-                        f"{iconset_path}/icon_{size}x{size}@2x.png"], check=False)
+    jobs = [(size, f"{iconset_path}/icon_{size}x{size}.png") for size in icon_sizes]
+    # Create 2x versions
+    jobs += [(size*2, f"{iconset_path}/icon_{size}x{size}@2x.png") for size in icon_sizes if size <= 512]
+    
+    def write_icon(job):
+        pixels, out_path = job
+        src.resize((pixels, pixels), Image.LANCZOS).save(out_path)
+    
+    # Each output is independent and Pillow releases the GIL while resizing and encoding
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(write_icon, jobs))
     
     # Convert iconset to icns
     run_command(["iconutil", "-c", "icns", str(iconset_path), "-o", "resources/icon.icns"], check=False)
@@ -47,6 +47,7 @@ hidden_imports = [
     'py_sip_xnu',
     'applescript',
     'markdown2',
+    'watchdog.observers.fsevents',
 ]
 
 # Add all submodules from the asterisk_popup package
@@ -61,7 +62,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Icons are drawn only on source launches; the app bundle ships them in resources
+    excludes=['_lazy_icons', 'cairosvg'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -6,8 +6,8 @@ This script is used to launch the main window in a separate process.
 
 import sys
 import os
-import json
 import logging
+import argparse
 
 # Set up logging
 logging.basicConfig(
@@ -15,64 +15,54 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.expanduser('~/Library/Logs/FreePBXPopup_Window.log'))
+        # Opened on the first record rather than at import
+        logging.FileHandler(os.path.expanduser('~/Library/Logs/FreePBXPopup_Window.log'), delay=True)
     ]
 )
 logger = logging.getLogger('FreePBXPopup.MainWindowLauncher')
 
 def main():
     """Main function"""
-    logger.info("Starting main window launcher")
+    logger.debug("Starting main window launcher")
 
     # Set environment variable to indicate this is a subprocess
     os.environ['FREEPBX_POPUP_SUBPROCESS'] = '1'
 
-    # Add --child argument to sys.argv to ensure we're recognized as a child process
-    if '--child' not in sys.argv:
-        sys.argv.append('--child')
+    # argparse prints the usage and exits if the config file is missing
+    parser = argparse.ArgumentParser(description="Launch the FreePBX Popup main window")
+    parser.add_argument('config', help="JSON config file for the window")
+    parser.add_argument('--child', action='store_true', help="Accepted for compatibility; the launcher always runs as a child process")
+    args = parser.parse_args()
+    config_file = args.config
 
-    if len(sys.argv) < 2:
-        logger.error("Usage: main_window_launcher.py <config_file>")
-        sys.exit(1)
-
-    # Find the config file argument
-    config_file = None
-    for arg in sys.argv:
-        if arg.endswith('.json'):
-            config_file = arg
-            break
-
-    if not config_file:
-        logger.error("No config file specified")
-        sys.exit(1)
-
-    logger.info(f"Using config file: {config_file}")
+    logger.debug(f"Using config file: {config_file}")
 
     try:
         # Import wx
         import wx
-        logger.info("Imported wx successfully")
+        logger.debug("Imported wx successfully")
 
         # Initialize wx app
         app = wx.App(False)
-        logger.info("Created wx app")
+        logger.debug("Created wx app")
 
         # Load config
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-            logger.info("Loaded config file")
+            from asterisk_popup.json_utils import load_file
+            from asterisk_popup.ipc import command_socket_path
+            config = load_file(config_file)
+            logger.debug("Loaded config file")
         except Exception as e:
             logger.error(f"Error loading config file: {e}")
             sys.exit(1)
 
         # Import the main window
         try:
-            logger.info("Attempting to import MainWindow")
+            logger.debug("Attempting to import MainWindow")
             from asterisk_popup.ui.wx.main_window import MainWindow
 
             # Create and show the main window
-            window = MainWindow(config)
+            window = MainWindow({'command_socket': command_socket_path(config_file)}, config_data=config)
             window.Show()
             logger.info("Showing main window")
 
@@ -88,14 +78,15 @@ def main():
             try:
                 import importlib.util
 
-                # Try to find the module file
+                # Let the import system's cached finders locate the module file
                 module_path = None
-                for path in sys.path:
-                    potential_path = os.path.join(path, 'asterisk_popup', 'ui', 'wx', 'main_window.py')
-                    if os.path.exists(potential_path):
-                        module_path = potential_path
-                        logger.info(f"Found module at: {potential_path}")
-                        break
+                try:
+                    found = importlib.util.find_spec('asterisk_popup.ui.wx.main_window')
+                except ImportError:
+                    found = None
+                if found and found.origin:
+                    module_path = found.origin
+                    logger.info(f"Found module at: {module_path}")
 
                 if module_path:
                     logger.info(f"Loading module from: {module_path}")
@@ -106,7 +97,7 @@ def main():
                     spec.loader.exec_module(main_window)
 
                     # Create and show the main window
-                    window = main_window.MainWindow(config)
+                    window = main_window.MainWindow({'command_socket': command_socket_path(config_file)}, config_data=config)
                     window.Show()
                     logger.info("Showing main window (direct import)")
 
@@ -7,6 +7,7 @@ Handles initialization, configuration, and resource setup before starting the ma
 import os
 import sys
 import signal
+import hashlib
 import subprocess
 
 def run_app():
@@ -16,11 +17,9 @@ def run_app():
     import platform
     if platform.system() == 'Darwin':
         try:
-            import objc
-            from Foundation import NSBundle
-            bundle = NSBundle.mainBundle()
-            info = bundle.localizedInfoDictionary() or bundle.infoDictionary()
-            info['LSUIElement'] = '1'
+            # Run as an accessory app: menu bar only, no dock icon
+            from AppKit import NSApplication, NSApplicationActivationPolicyAccessory
+            NSApplication.sharedApplication().setActivationPolicy_(NSApplicationActivationPolicyAccessory)
             print("Hiding dock icon")
         except Exception as e:
             print(f"Failed to hide dock icon: {e}")
@@ -38,6 +37,9 @@ def run_app():
         icon_path = os.path.join('resources', 'icon.png')
         if not os.path.exists(icon_path) or os.path.getsize(icon_path) < 1000:
             print("Icon not found or invalid. Creating icon...")
+
+            # Drawing pulls in cairosvg and Pillow, so only load it when an icon is missing
+            from _lazy_icons import create_icon
             create_icon()
 
         install_requirements()
@@ -65,7 +67,7 @@ def run_app():
 def create_default_config():
     """Create default configuration file"""
     try:
-        import json
+        from asterisk_popup.json_utils import dump_file
 
         config = {
             'ami': {
@@ -101,187 +103,39 @@ def create_default_config():
             os.makedirs(config_dir)
 
         config_path = os.path.join(config_dir, 'config.json')
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        dump_file(config_path, config)
 
         print(f"Default configuration created at {config_path}")
     except Exception as e:
         print(f"Error creating default configuration: {e}")
 
-def create_icon():
-    """Create icon for the application"""
-    try:
-        if not os.path.exists('resources'):
-            os.makedirs('resources')
-
-        try:
-            create_fa_icon()
-        except Exception as e:
-            print(f"Failed to create Font Awesome icon: {e}")
-            create_simple_icon()
-    except Exception as e:
-        print(f"Error creating icon: {e}")
-
-def create_fa_icon():
-    """Create a Font Awesome icon"""
-    try:
-        try:
-            import cairosvg
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'cairosvg'])
-            import cairosvg
-
-        try:
-            from PIL import Image
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'Pillow'])
-            from PIL import Image
-
-        import io
-
-        phone_icon_svg = """
-        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512">
-        <path fill="#3498db" d="M164.9 24.6c-7.7-18.6-28-28.5-47.4-23.2l-88 24C12.1 30.2 0 46 0 64C0 311.4 200.6 512 448 512c18 0 33.8-12.1 38.6-29.5l24-88c5.3-19.4-4.6-39.7-23.2-47.4l-96-40c-16.3-6.8-35.2-2.1-46.3 11.6L304.7 368C234.3 334.7 177.3 277.7 144 207.3L193.3 167c13.7-11.2 18.4-30 11.6-46.3l-40-96z"/>
-        </svg>
-        """
-
-        png_data = cairosvg.svg2png(bytestring=phone_icon_svg.encode('utf-8'),
-                                   output_width=128,
-                                   output_height=128)
-
-        img = Image.open(io.BytesIO(png_data))
-        img.save('resources/icon.png')
-
-        create_white_menu_bar_icon()
-
-        print("Font Awesome icon created at resources/icon.png")
-    except Exception as e:
-        print(f"Error creating Font Awesome icon: {e}")
-        raise
-
-def create_white_menu_bar_icon():
-    """Create a white menu bar icon"""
-    try:
-        try:
-            import cairosvg
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'cairosvg'])
-            import cairosvg
-
-        try:
-            from PIL import Image
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'Pillow'])
-            from PIL import Image
-
-        import io
-
-        phone_icon_svg = """
-        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512">
-        <path fill="#FFFFFF" d="M164.9 24.6c-7.7-18.6-28-28.5-47.4-23.2l-88 24C12.1 30.2 0 46 0 64C0 311.4 200.6 512 448 512c18 0 33.8-12.1 38.6-29.5l24-88c5.3-19.4-4.6-39.7-23.2-47.4l-96-40c-16.3-6.8-35.2-2.1-46.3 11.6L304.7 368C234.3 334.7 177.3 277.7 144 207.3L193.3 167c13.7-11.2 18.4-30 11.6-46.3l-40-96z"/>
-        </svg>
-        """
-
-        png_data = cairosvg.svg2png(bytestring=phone_icon_svg.encode('utf-8'),
-                                   output_width=22,
-                                   output_height=22)
-
-        img = Image.open(io.BytesIO(png_data))
-
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-
-        img.save('resources/menu_bar_icon.png')
-
-        print("White menu bar icon created at resources/menu_bar_icon.png")
-    except Exception as e:
-        print(f"Error creating white menu bar icon: {e}")
-
-def create_simple_icon():
-    """Create a simple icon"""
-    try:
-        try:
-            from PIL import Image, ImageDraw
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'Pillow'])
-            from PIL import Image, ImageDraw
-
-        img = Image.new('RGBA', (128, 128), color=(0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        padding = 16
-
-        draw.rounded_rectangle(
-            [(padding, padding), (128 - padding, 128 - padding)],
-            radius=12,
-            fill=(52, 152, 219)  # Blue color
-        )
-
-        center_x = 128 // 2
-        center_y = 128 // 2
-        circle_radius = 128 // 5
-        draw.ellipse(
-            [(center_x - circle_radius, center_y - circle_radius),
-             (center_x + circle_radius, center_y + circle_radius)],
-            fill=(255, 255, 255)  # White
-        )
-
-        inner_radius = circle_radius // 2
-        draw.ellipse(
-            [(center_x - inner_radius, center_y - inner_radius),
-             (center_x + inner_radius, center_y + inner_radius)],
-            fill=(41, 128, 185)  # Darker blue
-        )
-
-        img.save('resources/icon.png')
-
-        create_white_menu_bar_icon_simple()
-
-        print("Simple icon created at resources/icon.png")
-    except Exception as e:
-        print(f"Error creating simple icon: {e}")
-
-def create_white_menu_bar_icon_simple():
-    """Create a white menu bar icon from the simple icon"""
-    try:
-        try:
-            from PIL import Image, ImageDraw
-        except ImportError:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'Pillow'])
-            from PIL import Image, ImageDraw
-
-        img = Image.new('RGBA', (22, 22), color=(0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        padding = 2
-
-        draw.rounded_rectangle(
-            [(padding, padding), (22 - padding, 22 - padding)],
-            radius=3,
-            fill=(255, 255, 255)  # White color
-        )
-
-        center_x = 22 // 2
-        center_y = 22 // 2
-        circle_radius = 22 // 6
-        draw.ellipse(
-            [(center_x - circle_radius, center_y - circle_radius),
-             (center_x + circle_radius, center_y + circle_radius)],
-            fill=(0, 0, 0, 0)  # Transparent
-        )
-
-        img.save('resources/menu_bar_icon.png')
-
-        print("White menu bar icon created at resources/menu_bar_icon.png")
-    except Exception as e:
-        print(f"Error creating white menu bar icon: {e}")
-
 def install_requirements():
     """Install required packages"""
     try:
         if os.path.exists('requirements.txt'):
+            # Skip pip when these requirements were already installed for this interpreter
+            with open('requirements.txt', 'rb') as f:
+                deps_hash = hashlib.sha1(f.read() + sys.executable.encode('utf-8')).hexdigest()
+            stamp_path = os.path.expanduser('~/Library/Application Support/FreePBXPopup/.deps_hash')
+
+            try:
+                with open(stamp_path) as f:
+                    if f.read() == deps_hash:
+                        print("Requirements unchanged, skipping installation.")
+                        return
+            except OSError:
+                pass
+
             print("Installing requirements from requirements.txt...")
-            subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+            result = subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+
+            if result.returncode == 0:
+                try:
+                    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+                    with open(stamp_path, 'w') as f:
+                        f.write(deps_hash)
+                except OSError as e:
+                    print(f"Failed to record installed requirements: {e}")
         else:
             print("Installing required packages...")
             packages = [
@@ -292,9 +146,13 @@ def install_requirements():
                 'sqlalchemy>=2.0.0'
             ]
 
-            for package in packages:
-                print(f"Installing {package}...")
-                subprocess.run([sys.executable, '-m', 'pip', 'install', package])
+            # One pip run resolves and installs everything
+            print(f"Installing {', '.join(packages)}...")
+            subprocess.run([
+                sys.executable, '-m', 'pip', 'install',
+                '--no-input', '--disable-pip-version-check', '--no-color', '-q',
+                *packages
+            ])
     except Exception as e:
         print(f"Error installing requirements: {e}")
 